@@ -0,0 +1,212 @@
+"""Typed appliance records and the indexes platforms and handlers look them up by."""
+
+from typing import Iterator
+
+
+class Channel:
+    """
+    A channel of an appliance.
+
+    :param number: Channel number on the device.
+    :param name: Channel name from the configuration.
+    """
+
+    __slots__ = ("number", "name")
+
+    def __init__(self, number: int, name: str):
+        self.number = number
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Channel({self.number}, {self.name!r})"
+
+
+class Appliance:
+    """
+    A configured appliance.
+
+    ``device_id`` stays a list like in the rest of the integration (packets
+    and bus event types are built from it); ``key`` is its hashable form.
+
+    :param name: Appliance name, used as the entity name.
+    :param platform: Appliance type, e.g. ``"switch"`` or ``"rgbw"``.
+    :param device_id: Device id, e.g. ``[1, 10]``.
+    :param gateway: Gateway IP address.
+    :param channels: The appliance channels, in configuration order.
+    """
+
+    __slots__ = (
+        "name",
+        "platform",
+        "appliance_class",
+        "device_id",
+        "key",
+        "is_protected",
+        "gateway",
+        "channels",
+        "min",
+        "max",
+        "settings",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        platform: str,
+        device_id: list,
+        gateway: str,
+        channels: tuple,
+        appliance_class: str | None = None,
+        is_protected: bool = False,
+        min=None,
+        max=None,
+        settings=None,
+    ):
+        self.name = name
+        self.platform = platform
+        self.appliance_class = appliance_class
+        self.device_id = device_id
+        self.key = tuple(device_id)
+        self.is_protected = is_protected
+        self.gateway = gateway
+        self.channels = channels
+        self.min = min
+        self.max = max
+        self.settings = settings
+
+    @property
+    def channel_numbers(self) -> tuple:
+        return tuple(channel.number for channel in self.channels)
+
+    @classmethod
+    def from_config(cls, name: str, details: dict) -> "Appliance":
+        """Build a record from a parsed ``config_entries`` appliance dict."""
+        return cls(
+            name=name,
+            platform=details["appliance_type"],
+            device_id=details["device_id"],
+            gateway=details["gateway"],
+            channels=tuple(
+                Channel(channel["channel_number"], channel["channel_name"])
+                for channel in details["channels"]
+            ),
+            appliance_class=details["appliance_class"],
+            is_protected=details["is_protected"],
+            min=details["min"],
+            max=details["max"],
+            settings=details["settings"],
+        )
+
+    def as_config(self) -> dict:
+        """The appliance in the parsed configuration dict form."""
+        return {
+            "device_id": self.device_id,
+            "appliance_type": self.platform,
+            "appliance_class": self.appliance_class,
+            "is_protected": self.is_protected,
+            "gateway": self.gateway,
+            "channels": [
+                {"channel_number": channel.number, "channel_name": channel.name}
+                for channel in self.channels
+            ],
+            "min": self.min,
+            "max": self.max,
+            "settings": self.settings,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"Appliance({self.name!r}, {self.platform}, "
+            f"device_id={self.device_id}, channels={self.channel_numbers})"
+        )
+
+
+class Gateway:
+    """
+    A gateway and the appliances reached through it.
+
+    :param ip: Gateway IP address.
+    """
+
+    __slots__ = ("ip", "appliances")
+
+    def __init__(self, ip: str):
+        self.ip = ip
+        self.appliances: list[Appliance] = []
+
+    def __repr__(self) -> str:
+        return f"Gateway({self.ip}, {len(self.appliances)} appliances)"
+
+
+class ApplianceRegistry:
+    """
+    Appliance records indexed by platform, device and (device, channel).
+
+    The indexes are maintained by ``add`` and ``remove``, so every lookup
+    is a dict access.
+    """
+
+    def __init__(self):
+        self._by_platform: dict[str, list[Appliance]] = {}
+        self._by_device: dict[tuple, list[Appliance]] = {}
+        self._by_channel: dict[tuple, Appliance] = {}
+        self.gateways: dict[str, Gateway] = {}
+
+    def load(self, appliances: dict) -> "ApplianceRegistry":
+        """
+        Replace the content with parsed configuration appliances.
+
+        :param appliances: appliance name -> appliance dict, as built by
+            ``TISApi.parse_device_manager_request``.
+        """
+        self.clear()
+        for name, details in appliances.items():
+            self.add(Appliance.from_config(name, details))
+        return self
+
+    def clear(self):
+        self._by_platform.clear()
+        self._by_device.clear()
+        self._by_channel.clear()
+        self.gateways.clear()
+
+    def add(self, appliance: Appliance):
+        self._by_platform.setdefault(appliance.platform, []).append(appliance)
+        self._by_device.setdefault(appliance.key, []).append(appliance)
+        for channel in appliance.channels:
+            self._by_channel[(appliance.key, channel.number)] = appliance
+        gateway = self.gateways.get(appliance.gateway)
+        if gateway is None:
+            gateway = self.gateways[appliance.gateway] = Gateway(appliance.gateway)
+        gateway.appliances.append(appliance)
+
+    def remove(self, appliance: Appliance):
+        self._by_platform[appliance.platform].remove(appliance)
+        self._by_device[appliance.key].remove(appliance)
+        for channel in appliance.channels:
+            if self._by_channel.get((appliance.key, channel.number)) is appliance:
+                del self._by_channel[(appliance.key, channel.number)]
+        self.gateways[appliance.gateway].appliances.remove(appliance)
+
+    @property
+    def platforms(self) -> list[str]:
+        return [
+            platform for platform, appliances in self._by_platform.items() if appliances
+        ]
+
+    def by_platform(self, platform: str) -> list[Appliance]:
+        return self._by_platform.get(platform, [])
+
+    def by_device(self, device_id) -> list[Appliance]:
+        return self._by_device.get(tuple(device_id), [])
+
+    def get(self, device_id, channel: int) -> Appliance | None:
+        """Appliance owning ``channel`` of ``device_id``, if any."""
+        return self._by_channel.get((tuple(device_id), channel))
+
+    def __len__(self) -> int:
+        return sum(len(appliances) for appliances in self._by_platform.values())
+
+    def __iter__(self) -> Iterator[Appliance]:
+        for appliances in self._by_platform.values():
+            yield from appliances
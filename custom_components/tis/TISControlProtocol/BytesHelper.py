@@ -1,5 +1,5 @@
 import binascii
-from TISControlProtocol.crc import checkCRC, packCRC
+from TISControlProtocol.crc import checkCRC, packCRC, compute  # noqa: F401
 
 
 def bytes2hex(data, rtype=[]):
@@ -52,7 +52,9 @@ def build_packet(
         + device_id
         + additional_packets
     )
-    packet = packCRC(packet)
+    crc = compute(packet)
+    packet.append(crc >> 8)
+    packet.append(crc & 0xFF)
     return packet
 
 
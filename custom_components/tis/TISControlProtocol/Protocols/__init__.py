@@ -10,7 +10,6 @@ async def setup_udp_protocol(
 ) -> tuple[socket.socket, PacketProtocol]:
     transport, protocol = await loop.create_datagram_endpoint(
         lambda: PacketProtocol(sock, udp_ip, udp_port, hass),
-        remote_addr=(udp_ip, udp_port),
         local_addr=("0.0.0.0", udp_port),
         allow_broadcast=True,
         reuse_port=True,
@@ -4,47 +4,30 @@ from typing import Union
 import logging
 
 class AckCoordinator:
-    def __init__(self):
-        self.ack_events = ack_events
-
-    def create_ack_event(self, unique_id: Union[str, tuple]) -> asyncio.Event:
-        logging.info(f"creating ack event for {unique_id}")
-        event = asyncio.Event()
-        self.ack_events[unique_id] = event
-        return event
+    """
+    Bookkeeping of the commands waiting for an ack.
 
-    def get_ack_event(self, unique_id: Union[str, tuple]) -> Union[asyncio.Event, None]:
-        return self.ack_events.get(unique_id)
+    Each waiting command owns a future stored under its unique id in
+    ``shared.ack_events``, with the value its ack must report (None if
+    any ack will do); packet handlers resolve them with
+    ``shared.resolve_ack``. The sender removes its future when the command
+    finishes, whatever the outcome, so nothing is left behind.
+    """
 
-    def remove_ack_event(self, unique_id: Union[str, tuple]) -> None:
-        if unique_id in self.ack_events:
-            del self.ack_events[unique_id]
-
-    # async def create_ack_task(
-    #     self,
-    #     sender,
-    #     packet,
-    #     packet_dict=None,
-    #     channel_number=None,
-    #     attempts=3,
-    #     timeout=5.0,
-    # ) -> bool:
-    #     unique_id = (
-    #         (tuple(packet_dict["device_id"])),
-    #         packet_dict["operation_code"],
-    #         channel_number,
-    #     )
-    #     event = self.create_ack_event(unique_id)
+    def __init__(self):
+        self.ack_events = ack_events
 
-    #     for attempt in range(attempts):
-    #         sender.send_packet(packet)
-    #         try:
-    #             await asyncio.wait_for(event.wait(), timeout)
-    #             self.remove_ack_event(unique_id)
-    #             return True
-    #         except asyncio.TimeoutError:
-    #             print(
-    #                 f"ack not received within {timeout} seconds, attempt {attempt + 1}"
-    #             )
+    def create_ack_future(
+        self, unique_id: Union[str, tuple], expected: int | None = None
+    ) -> asyncio.Future:
+        logging.debug(f"creating ack future for {unique_id}")
+        future = asyncio.get_running_loop().create_future()
+        self.ack_events.setdefault(unique_id, {})[future] = expected
+        return future
 
-    #     return False
+    def remove_ack_future(self, unique_id: Union[str, tuple], future: asyncio.Future) -> None:
+        futures = self.ack_events.get(unique_id)
+        if futures is not None:
+            futures.pop(future, None)
+            if not futures:
+                del self.ack_events[unique_id]
@@ -0,0 +1,111 @@
+from datetime import timedelta
+import logging
+import time
+
+from homeassistant.core import HomeAssistant  # type: ignore
+from homeassistant.helpers.event import async_track_time_interval  # type: ignore
+
+from TISControlProtocol.Protocols.udp.PacketDispatcher import PacketDispatcher
+from TISControlProtocol.Protocols.udp.PacketSender import PacketSender
+from TISControlProtocol.Protocols.udp.ProtocolHandler import TISProtocolHandler
+
+# DiscoveryCache.py
+REFRESH_INTERVAL = timedelta(minutes=5)
+DEVICE_TTL = timedelta(minutes=30)
+# device type of the frames we send ourselves
+OWN_DEVICE_TYPE = (0xFF, 0xFE)
+
+
+class DiscoveryCache:
+    """
+    Devices seen on the network, learned passively from every frame.
+
+    Every valid frame carries the sender's device id, device type and the
+    gateway address in its header, so the cache is filled by watching the
+    dispatcher, without any extra traffic. A single discovery broadcast
+    every ``refresh_interval`` (on the discovery lane) picks up devices
+    that stay silent. Entries record when the device was first and last
+    seen; devices not seen for ``ttl`` are dropped on the next refresh.
+
+    :param hass: The Home Assistant instance.
+    :param sender: The PacketSender used for the background broadcasts.
+    :param dispatcher: The PacketDispatcher whose frames feed the cache.
+    :param refresh_interval: Time between two background broadcasts.
+    :param ttl: Time after which a silent device is forgotten.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        sender: PacketSender,
+        dispatcher: PacketDispatcher,
+        refresh_interval: timedelta = REFRESH_INTERVAL,
+        ttl: timedelta = DEVICE_TTL,
+    ):
+        self.hass = hass
+        self.sender = sender
+        self.refresh_interval = refresh_interval
+        self.ttl = ttl
+        self.discovery_packet = TISProtocolHandler().generate_discovery_packet()
+        # device id -> {device_id, device_type, source_ip, first_seen, last_seen}
+        self.devices: dict[tuple, dict] = {}
+        self._unsub = None
+        dispatcher.observers.append(self.observe)
+
+    def observe(self, info):
+        data = info.raw
+        if (data[19], data[20]) == OWN_DEVICE_TYPE:
+            return
+        now = time.time()
+        entry = self.devices.get((data[17], data[18]))
+        if entry is None:
+            self.devices[(data[17], data[18])] = {
+                "device_id": info.device_id,
+                "device_type": info.device_type,
+                "source_ip": info.source_ip,
+                "first_seen": now,
+                "last_seen": now,
+            }
+        else:
+            entry["last_seen"] = now
+
+    def get_devices(self, device_ids=None) -> list:
+        """
+        Cached devices seen within the ttl.
+
+        :param device_ids: Only return these device ids (tuples).
+        :return: Entries with device_id, device_type, source_ip, first_seen
+            and last_seen (epoch seconds).
+        """
+        oldest = time.time() - self.ttl.total_seconds()
+        if device_ids is None:
+            entries = self.devices.values()
+        else:
+            entries = filter(None, map(self.devices.get, device_ids))
+        return [entry for entry in entries if entry["last_seen"] >= oldest]
+
+    def start(self):
+        """Broadcast once now and then every refresh_interval."""
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_refresh, self.refresh_interval
+            )
+            self.hass.async_create_task(self._async_refresh())
+
+    def stop(self):
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    async def _async_refresh(self, now=None):
+        oldest = time.time() - self.ttl.total_seconds()
+        expired = [key for key, entry in self.devices.items() if entry["last_seen"] < oldest]
+        for key in expired:
+            del self.devices[key]
+        logging.info(
+            f"discovery cache: {len(self.devices)} devices, {len(expired)} expired"
+        )
+        try:
+            await self.sender.broadcast_packet(self.discovery_packet)
+        except Exception as e:
+            logging.error(f"error broadcasting discovery packet: {e}")
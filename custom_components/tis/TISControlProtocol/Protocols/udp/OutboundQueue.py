@@ -0,0 +1,152 @@
+import asyncio
+from collections import deque
+import logging
+import time
+
+from TISControlProtocol.Protocols.udp.TokenBucket import TokenBucket
+
+# OutboundQueue.py
+MIN_GAP = 0.02
+MAX_BURST = 4
+LATENCY_SAMPLES = 1024
+
+# priority lanes, lower is served first
+PRIORITY_CONTROL = 0
+PRIORITY_RETRANSMIT = 1
+PRIORITY_POLL = 2
+PRIORITY_DISCOVERY = 3
+PRIORITY_TELEMETRY = PRIORITY_DISCOVERY
+LANES = {
+    PRIORITY_CONTROL: "control",
+    PRIORITY_RETRANSMIT: "retransmit",
+    PRIORITY_POLL: "poll",
+    PRIORITY_DISCOVERY: "discovery",
+}
+
+
+def latency_summary(samples) -> dict:
+    """Sample count, p50 and p99 of latency samples in seconds."""
+    samples = sorted(samples)
+    if not samples:
+        return {"count": 0, "p50": None, "p99": None}
+    return {
+        "count": len(samples),
+        "p50": samples[(len(samples) - 1) // 2],
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+class OutboundQueue:
+    """
+    Paced send path over the protocol's DatagramTransport.
+
+    Every destination (gateway address) gets its own queue and token
+    bucket: up to ``max_burst`` frames leave back to back, after that one
+    frame per ``min_gap`` seconds, so a burst of commands does not overflow
+    the gateway's buffer towards the RS485 bus. A frame that finds its
+    queue empty and a token available is sent immediately; the others
+    wait in FIFO order within their lane and are released from a loop
+    timer.
+
+    ``stats`` holds, per destination, the current and peak queue depth,
+    the frames sent, how many of them had to wait, and the total and
+    maximum wait in seconds.
+
+    Each destination queue is split into priority lanes (interactive
+    control, acks/retransmits, state polls, discovery/telemetry). When
+    frames are waiting, the highest lane goes first, so a command never
+    queues behind polls. ``latency`` reports p50/p99 of the time a frame
+    waited in its lane before reaching the transport (0 when it was sent
+    right away), over the last LATENCY_SAMPLES frames per lane. The time
+    until a command is acked is measured by PacketSender.
+
+    :param min_gap: Minimum seconds between frames once the burst is used.
+    :param max_burst: Frames that may be sent back to back.
+    """
+
+    def __init__(self, min_gap: float = MIN_GAP, max_burst: int = MAX_BURST):
+        self.min_gap = min_gap
+        self.max_burst = max_burst
+        self.transport: asyncio.DatagramTransport | None = None
+        self._queues: dict[tuple, list[deque]] = {}
+        self._buckets: dict[tuple, TokenBucket] = {}
+        self._timers: dict[tuple, asyncio.TimerHandle] = {}
+        self.stats: dict[tuple, dict] = {}
+        self._latencies = {lane: deque(maxlen=LATENCY_SAMPLES) for lane in LANES}
+
+    def _destination(self, addr: tuple):
+        queue = self._queues.get(addr)
+        if queue is None:
+            queue = self._queues[addr] = [deque() for _ in LANES]
+            self._buckets[addr] = TokenBucket(1 / self.min_gap, self.max_burst)
+            self.stats[addr] = {
+                "depth": 0,
+                "max_depth": 0,
+                "sent": 0,
+                "queued": 0,
+                "wait_total": 0.0,
+                "wait_max": 0.0,
+            }
+        return queue, self._buckets[addr], self.stats[addr]
+
+    def send(
+        self, data: bytes, addr: tuple, priority: int = PRIORITY_POLL
+    ) -> asyncio.Future | None:
+        """
+        Send ``data`` to ``addr`` now or queue it behind earlier frames.
+
+        :param priority: Lane of the frame, one of the PRIORITY_* values.
+        :return: None if the frame was sent right away, otherwise a future
+            resolved once it has been handed to the transport.
+        """
+        lanes, bucket, stats = self._destination(addr)
+        if not stats["depth"] and bucket.try_acquire():
+            self._latencies[priority].append(0.0)
+            self._transmit(data, addr, stats)
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        lanes[priority].append((data, time.monotonic(), future))
+        stats["queued"] += 1
+        stats["depth"] += 1
+        if stats["depth"] > stats["max_depth"]:
+            stats["max_depth"] = stats["depth"]
+        if addr not in self._timers:
+            self._schedule(addr, bucket)
+        return future
+
+    def _schedule(self, addr: tuple, bucket: TokenBucket):
+        self._timers[addr] = asyncio.get_running_loop().call_later(
+            bucket.delay(), self._drain, addr
+        )
+
+    def _drain(self, addr: tuple):
+        del self._timers[addr]
+        lanes, bucket, stats = self._destination(addr)
+        while stats["depth"] and bucket.try_acquire():
+            priority, lane = next((p, lane) for p, lane in enumerate(lanes) if lane)
+            data, queued_at, future = lane.popleft()
+            stats["depth"] -= 1
+            waited = time.monotonic() - queued_at
+            stats["wait_total"] += waited
+            if waited > stats["wait_max"]:
+                stats["wait_max"] = waited
+            self._latencies[priority].append(waited)
+            self._transmit(data, addr, stats)
+            if not future.done():
+                future.set_result(None)
+        if stats["depth"]:
+            self._schedule(addr, bucket)
+
+    def latency(self) -> dict:
+        """p50/p99 queue wait in seconds and sample count per lane."""
+        return {
+            name: latency_summary(self._latencies[lane]) for lane, name in LANES.items()
+        }
+
+    def _transmit(self, data: bytes, addr: tuple, stats: dict):
+        if self.transport is None:
+            logging.error(f"no transport, dropping frame for {addr}")
+            return
+        self.transport.sendto(data, addr)
+        stats["sent"] += 1
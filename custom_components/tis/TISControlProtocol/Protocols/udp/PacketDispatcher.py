@@ -1,20 +1,43 @@
 from homeassistant.core import HomeAssistant  # type: ignore
+import asyncio
 import logging
 
 
 class PacketDispatcher:
+    """
+    Route parsed frames to their packet handlers.
+
+    Handlers are plain callbacks that run inline when ``PacketQueue``
+    drains its batch of received frames on the event loop, so dispatching
+    a frame creates no task.
+    A handler that really needs to await opts in by being a coroutine
+    function; those are scheduled with ``hass.async_create_task``.
+
+    Observers in ``observers`` are called with every valid frame before
+    its handler, whether or not its operation code is known.
+    """
+
     def __init__(self, hass: HomeAssistant, OPERATIONS_DICT: dict):
         self.hass = hass
         self.operations_dict = OPERATIONS_DICT
+        self.coroutine_operations = {
+            operation_code
+            for operation_code, packet_handler in OPERATIONS_DICT.items()
+            if asyncio.iscoroutinefunction(packet_handler)
+        }
+        self.observers = []
 
-    async def dispatch_packet(self, info):
+    def dispatch_packet(self, info):
         try:
-            packet_handler = self.operations_dict.get(
-                tuple(info["operation_code"]), "unknown operation"
-            )
-            if packet_handler != "unknown operation":
-                await packet_handler(self.hass, info)
+            for observer in self.observers:
+                observer(info)
+            operation_code = info.opcode
+            packet_handler = self.operations_dict.get(operation_code)
+            if packet_handler is None:
+                logging.info(f"unknown operation code: {info.operation_code}")
+            elif operation_code in self.coroutine_operations:
+                self.hass.async_create_task(packet_handler(self.hass, info))
             else:
-                logging.info(f"unknown operation code: {info['operation_code']}")
+                packet_handler(self.hass, info)
         except Exception as e:
             logging.info(f"error in dispatching packet: {e} , {info}")
@@ -1,22 +1,15 @@
-from TISControlProtocol.BytesHelper import checkCRC
+from TISControlProtocol.crc import verify
+from TISControlProtocol.Protocols.udp.PacketFrame import PacketFrame, MIN_FRAME_LENGTH
 import logging
 
 
 # PacketExtractor.py
 class PacketExtractor:
     @staticmethod
-    def extract_info(packet: list):
-        packet_check = checkCRC(packet)
-        info = {}
-        if packet_check:
-            logging.info("correct packet")
-            info["source_ip"] = packet[0:4]
-            info["device_id"] = packet[17:19]
-            info["device_type"] = packet[19:21]
-            info["operation_code"] = packet[21:23]
-            info["source_device_id"] = packet[23:25]
-            info["additional_bytes"] = packet[25:-2]
+    def extract_info(packet: bytes) -> PacketFrame | None:
+        if len(packet) >= MIN_FRAME_LENGTH and verify(packet):
+            logging.debug("correct packet")
+            return PacketFrame(packet)
 
-        else:
-            logging.info("wrong packet")
-        return info
+        logging.info("wrong packet")
+        return None
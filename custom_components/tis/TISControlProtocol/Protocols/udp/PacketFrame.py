@@ -0,0 +1,111 @@
+"""Zero-copy view over a received TIS frame."""
+
+# PacketFrame.py
+SOURCE_IP = slice(0, 4)
+DEVICE_ID = slice(17, 19)
+DEVICE_TYPE = slice(19, 21)
+OPERATION_CODE = slice(21, 23)
+SOURCE_DEVICE_ID = slice(23, 25)
+PAYLOAD_OFFSET = 25
+# ip(4) + header(10) + lead code(2) + length(1) + ids/opcode(8) + crc(2)
+MIN_FRAME_LENGTH = 27
+
+
+class PacketFrame:
+    """
+    Read-only view of a datagram that decodes header fields on demand.
+
+    Every field is an offset into the original buffer, so building a frame
+    costs one memoryview. Conversions to lists happen only when a handler
+    asks for them; the payload list is cached because handlers index it
+    repeatedly. Item access (``frame["device_id"]``) is kept so handlers
+    written against the old info dict keep working.
+
+    :param data: The raw datagram as received from the transport.
+    """
+
+    __slots__ = ("_data", "_view", "_additional_bytes")
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._view = memoryview(data)
+        self._additional_bytes = None
+
+    @property
+    def raw(self) -> bytes:
+        return self._data
+
+    @property
+    def source_ip(self) -> list:
+        return self._view[SOURCE_IP].tolist()
+
+    @property
+    def device_id(self) -> list:
+        return self._view[DEVICE_ID].tolist()
+
+    @property
+    def device_key(self) -> tuple:
+        """Hashable device id, e.g. ``(1, 10)``."""
+        data = self._data
+        return (data[17], data[18])
+
+    @property
+    def device_type(self) -> list:
+        return self._view[DEVICE_TYPE].tolist()
+
+    @property
+    def opcode(self) -> tuple:
+        """Hashable operation code, matching the OPERATIONS_DICT keys."""
+        data = self._data
+        return (data[21], data[22])
+
+    @property
+    def operation_code(self) -> list:
+        return self._view[OPERATION_CODE].tolist()
+
+    @property
+    def source_device_id(self) -> list:
+        return self._view[SOURCE_DEVICE_ID].tolist()
+
+    @property
+    def payload(self) -> memoryview:
+        """Payload bytes (between the header and the CRC) without copying."""
+        return self._view[PAYLOAD_OFFSET:-2]
+
+    @property
+    def additional_bytes(self) -> list:
+        if self._additional_bytes is None:
+            self._additional_bytes = self._view[PAYLOAD_OFFSET:-2].tolist()
+        return self._additional_bytes
+
+    def __getitem__(self, key: str):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        if key not in _FIELDS:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELDS
+
+    def __repr__(self) -> str:
+        return (
+            f"PacketFrame(device_id={self.device_id}, "
+            f"operation_code={self.operation_code}, "
+            f"additional_bytes={self.additional_bytes})"
+        )
+
+
+_FIELDS = frozenset(
+    (
+        "source_ip",
+        "device_id",
+        "device_type",
+        "operation_code",
+        "source_device_id",
+        "additional_bytes",
+    )
+)
@@ -1,8 +1,9 @@
-from homeassistant.core import HomeAssistant  # type: ignore
+from homeassistant.core import HomeAssistant, callback  # type: ignore
 import logging
 
 
-async def handle_auto_binary_feedback(hass: HomeAssistant, info: dict):
+@callback
+def handle_auto_binary_feedback(hass: HomeAssistant, info: dict):
     logging.info(f"Auto Binary Feedback: {info}")
     channels_number: int = info["additional_bytes"][0]
     channels_values: list = info["additional_bytes"][channels_number :]
@@ -1,17 +1,27 @@
-from homeassistant.core import HomeAssistant  # type: ignore
+from homeassistant.core import HomeAssistant, callback  # type: ignore
+from TISControlProtocol.shared import subscriptions, with_raw_bytes
 import logging
 
 
-async def handle_binary_feedback(hass: HomeAssistant, info: dict):
-    # remove auxilary bytes which represents number of scenarios
-    len_aux = info["additional_bytes"][0]
-    info["additional_bytes"] = info["additional_bytes"][len_aux + 1 :]
+@callback
+def handle_binary_feedback(hass: HomeAssistant, info: dict):
+    # skip the auxiliary bytes (number of scenarios), then the channel
+    # count and one bit per channel, least significant bit first
+    payload = info.payload
+    len_aux = payload[0]
+    channels_number = payload[len_aux + 1]
+    states = int.from_bytes(
+        payload[len_aux + 2 : len_aux + 2 + (channels_number + 7) // 8], "little"
+    )
     event_data = {
         "device_id": info["device_id"],
         "feedback_type": "binary_feedback",
-        "additional_bytes": info["additional_bytes"],
+        "channel_number": channels_number,
+        # channel n is on if bit n - 1 is set
+        "states": states,
     }
+    with_raw_bytes(event_data, info)
     try:
-        hass.bus.async_fire(str(info["device_id"]), event_data)
+        subscriptions.publish(hass, info["device_id"], event_data)
     except Exception as e:
         logging.error(f"error in firing event: {e}")
@@ -1,11 +1,13 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from TISControlProtocol.shared import subscriptions
 import logging
 
 AC_NUMBER_MAP = {0x19: 0, 0x1A: 1, 0x1B: 2, 0x1C: 3, 0x1D: 4, 0x1E: 5, 0x1F: 6, 0x20: 7}
 FLOOR_NUMBER_MAP = {0x22: 0, 0x23: 1, 0x24: 2, 0x25: 3}
 
 
-async def handle_climate_binary_feedback(hass: HomeAssistant, info: dict):
+@callback
+def handle_climate_binary_feedback(hass: HomeAssistant, info: dict):
     # NOTE: Sometimes the packet contains number of floor heater and sometimes no floor heater num is given
     # check sub_operation or number
     if info["additional_bytes"][0] <= 0x18:
@@ -56,7 +58,7 @@ async def handle_climate_binary_feedback(hass: HomeAssistant, info: dict):
     }
 
     try:
-        hass.bus.async_fire(str(info["device_id"]), event_data)
+        subscriptions.publish(hass, info["device_id"], event_data)
 
     except Exception as e:
         logging.error(f"error in firing event: {e}")
@@ -1,34 +1,30 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 import logging
-import asyncio
-from TISControlProtocol.shared import ack_events
+from TISControlProtocol.shared import resolve_ack, subscriptions, with_raw_bytes
 
 
-async def handle_control_response(hass: HomeAssistant, info: dict):
-    channel_number = info["additional_bytes"][0]
-    # await target_appliance.handle_packet(info["additional_bytes"], "control")
+@callback
+def handle_control_response(hass: HomeAssistant, info: dict):
+    payload = info.payload
+    channel_number = payload[0]
     event_data = {
         "device_id": info["device_id"],
         "channel_number": channel_number,
         "feedback_type": "control_response",
-        "additional_bytes": info["additional_bytes"],
+        "value": payload[2],
     }
+    with_raw_bytes(event_data, info)
     try:
-        hass.bus.async_fire(str(info["device_id"]), event_data)
+        subscriptions.publish(hass, info["device_id"], event_data, channel_number)
     except Exception as e:
         logging.error(f"error in firing event for feedback: {e}")
 
     try:
-        event: asyncio.Event = ack_events.get(
-            (
-                tuple(info["device_id"]),
-                (0x00, 0x31),
-                int(channel_number),
-            )
-        )
-        if event is not None:
-            logging.info(f"setting event for control response {info["device_id"]}")
-            event.set()
+        if resolve_ack(
+            (tuple(info["device_id"]), (0x00, 0x31), int(channel_number)),
+            event_data["value"],
+        ):
+            logging.info(f"resolved ack for control response {info["device_id"]}")
     except Exception as e:
-        logging.error(f"error in setting event for feedback: {e}")
+        logging.error(f"error in resolving ack for feedback: {e}")
@@ -1,10 +1,9 @@
-from homeassistant.core import HomeAssistant  # type: ignore
+from homeassistant.core import HomeAssistant, callback  # type: ignore
 
 
-async def handle_discovery_feedback(hass: HomeAssistant, info: dict):
-    # check if the record already exists if not add it
-    if not any(
-        device["device_id"] == info["device_id"]
-        for device in hass.data["tis_control"]["discovered_devices"]
-    ):
-        hass.data["tis_control"]["discovered_devices"].append(info)
+@callback
+def handle_discovery_feedback(hass: HomeAssistant, info: dict):
+    # keep the first record of every device
+    hass.data["tis_control"]["discovered_devices"].setdefault(
+        tuple(info["device_id"]), info
+    )
@@ -1,84 +1,145 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from TISControlProtocol.shared import subscriptions, with_raw_bytes
 import struct
 import logging
+from typing import Callable
 
+# fields of the 0x65 meter report, in payload order
+ENERGY_FIELDS = (
+    "v1",
+    "v2",
+    "v3",
+    "current_p1",
+    "current_p2",
+    "current_p3",
+    "active_p1",
+    "active_p2",
+    "active_p3",
+    "apparent1",
+    "apparent2",
+    "apparent3",
+    "reactive1",
+    "reactive2",
+    "reactive3",
+    "pf1",
+    "pf2",
+    "pf3",
+    "pa1",
+    "pa2",
+    "pa3",
+    "avg_live_to_neutral",
+    "avg_current",
+    "sum_current",
+    "total_power",
+    "total_volt_amps",
+    "total_var",
+    "total_pf",
+    "total_pa",
+    "frq",
+)
+# big endian floats from payload offset 3: the 24 per-phase and average
+# values, then the totals with the unused words between them skipped
+ENERGY_STRUCT = struct.Struct(">24f8xf4xf4xff4xf4xf")
+ENERGY_OFFSET = 3
+_ALL_FIELDS = tuple(enumerate(ENERGY_FIELDS))
 
-def big_endian_to_num(str_list):
-    big_endian = "".join(f"{x:02x}" for x in str_list)
-    value = struct.unpack(">f", bytes.fromhex(big_endian))[0]
-    return round(value, 1)
+# (device_id, channel) -> {field index: number of entities using it}
+_tracked_fields: dict[tuple, dict] = {}
+_tracked_cache: dict[tuple, tuple] = {}
 
 
-async def handle_energy_feedback(hass: HomeAssistant, info: dict):
+def track_energy_field(device_id, channel: int, field: str) -> Callable[[], None]:
+    """
+    Mark ``field`` as used by an entity of ``channel`` of ``device_id``.
+
+    Once a channel has tracked fields, its meter reports only decode
+    those; channels without any decode every field.
+
+    :return: A callable that releases the field again.
+    """
+    key = (tuple(device_id), int(channel))
+    index = ENERGY_FIELDS.index(field)
+    fields = _tracked_fields.setdefault(key, {})
+    fields[index] = fields.get(index, 0) + 1
+    _tracked_cache.pop(key, None)
+
+    def untrack():
+        fields = _tracked_fields.get(key)
+        if not fields or index not in fields:
+            return
+        fields[index] -= 1
+        if not fields[index]:
+            del fields[index]
+            if not fields:
+                del _tracked_fields[key]
+        _tracked_cache.pop(key, None)
+
+    return untrack
+
+
+def _decoded_fields(key: tuple) -> tuple:
+    fields = _tracked_cache.get(key)
+    if fields is None:
+        tracked = _tracked_fields.get(key)
+        fields = _tracked_cache[key] = (
+            tuple((index, ENERGY_FIELDS[index]) for index in sorted(tracked))
+            if tracked
+            else _ALL_FIELDS
+        )
+    return fields
+
+
+def decode_energy(payload, fields=_ALL_FIELDS) -> dict:
+    """
+    Decode a 0x65 meter report in a single unpack.
+
+    :param payload: Frame payload (additional bytes).
+    :param fields: ``(index, name)`` pairs of the fields to return.
+    :raises struct.error: If the payload is too short.
+    """
+    values = ENERGY_STRUCT.unpack_from(payload, ENERGY_OFFSET)
+    return {name: round(values[index], 1) for index, name in fields}
+
+
+@callback
+def handle_energy_feedback(hass: HomeAssistant, info: dict):
     """
     Handle the feedback from an energy sensor.
     """
     device_id = info["device_id"]
-    channel_num = int(info["additional_bytes"][0]) + 1
-    sub_operation = int(info["additional_bytes"][1])
+    payload = info.payload
+    channel_num = payload[0] + 1
+    sub_operation = payload[1]
 
     if sub_operation == 0xDA:
-        energy = int(
-            (info["additional_bytes"][16] << 8) | (info["additional_bytes"][17])
-        )
+        energy = (payload[16] << 8) | payload[17]
 
         event_data = {
             "device_id": device_id,
             "channel_num": channel_num,
             "feedback_type": "monthly_energy_feedback",
             "energy": energy,
-            "additional_bytes": info["additional_bytes"],
         }
+        with_raw_bytes(event_data, info)
 
         try:
-            hass.bus.async_fire(str(info["device_id"]), event_data)
+            subscriptions.publish(hass, info["device_id"], event_data)
         except Exception as e:
             logging.error(f"error in firing event for feedback: {e}")
     elif sub_operation == 0x65:
         try:
-            energy = {
-                "v1": big_endian_to_num(info["additional_bytes"][3:7]),
-                "v2": big_endian_to_num(info["additional_bytes"][7:11]),
-                "v3": big_endian_to_num(info["additional_bytes"][11:15]),
-                "current_p1": big_endian_to_num(info["additional_bytes"][15:19]),
-                "current_p2": big_endian_to_num(info["additional_bytes"][19:23]),
-                "current_p3": big_endian_to_num(info["additional_bytes"][23:27]),
-                "active_p1": big_endian_to_num(info["additional_bytes"][27:31]),
-                "active_p2": big_endian_to_num(info["additional_bytes"][31:35]),
-                "active_p3": big_endian_to_num(info["additional_bytes"][35:39]),
-                "apparent1": big_endian_to_num(info["additional_bytes"][39:43]),
-                "apparent2": big_endian_to_num(info["additional_bytes"][43:47]),
-                "apparent3": big_endian_to_num(info["additional_bytes"][47:51]),
-                "reactive1": big_endian_to_num(info["additional_bytes"][51:55]),
-                "reactive2": big_endian_to_num(info["additional_bytes"][55:59]),
-                "reactive3": big_endian_to_num(info["additional_bytes"][59:63]),
-                "pf1": big_endian_to_num(info["additional_bytes"][63:67]),
-                "pf2": big_endian_to_num(info["additional_bytes"][67:71]),
-                "pf3": big_endian_to_num(info["additional_bytes"][71:75]),
-                "pa1": big_endian_to_num(info["additional_bytes"][75:79]),
-                "pa2": big_endian_to_num(info["additional_bytes"][79:83]),
-                "pa3": big_endian_to_num(info["additional_bytes"][83:87]),
-                "avg_live_to_neutral": big_endian_to_num(
-                    info["additional_bytes"][87:91]
-                ),
-                "avg_current": big_endian_to_num(info["additional_bytes"][91:95]),
-                "sum_current": big_endian_to_num(info["additional_bytes"][95:99]),
-                "total_power": big_endian_to_num(info["additional_bytes"][107:111]),
-                "total_volt_amps": big_endian_to_num(info["additional_bytes"][115:119]),
-                "total_var": big_endian_to_num(info["additional_bytes"][123:127]),
-                "total_pf": big_endian_to_num(info["additional_bytes"][127:131]),
-                "total_pa": big_endian_to_num(info["additional_bytes"][135:139]),
-                "frq": big_endian_to_num(info["additional_bytes"][143:147]),
-            }
+            energy = decode_energy(
+                payload, _decoded_fields((tuple(device_id), channel_num))
+            )
 
             event_data = {
                 "device_id": device_id,
                 "channel_num": channel_num,
                 "feedback_type": "energy_feedback",
                 "energy": energy,
-                "additional_bytes": info["additional_bytes"],
             }
+            with_raw_bytes(event_data, info)
 
-            hass.bus.async_fire(str(info["device_id"]), event_data)
+            subscriptions.publish(hass, info["device_id"], event_data)
         except Exception as e:
             logging.error(f"error in firing event for feedback: {e}")
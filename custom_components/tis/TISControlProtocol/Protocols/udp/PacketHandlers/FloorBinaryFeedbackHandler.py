@@ -1,23 +1,28 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from TISControlProtocol.shared import subscriptions
+from TISControlProtocol.Protocols.udp.PayloadCodec import CODECS
 import logging
 
 
-async def handle_floor_binary_feedback(hass: HomeAssistant, info: dict):
+@callback
+def handle_floor_binary_feedback(hass: HomeAssistant, info: dict):
     # check sub_operation or number
-    number = info["additional_bytes"][0]
-    state = info["additional_bytes"][3]
-    temp = info["additional_bytes"][5]
+    try:
+        feedback = CODECS[info.opcode].decode_frame(info.raw)
+    except ValueError as e:
+        logging.error(f"error in decoding floor feedback: {e}")
+        return
 
     event_data = {
         "device_id": info["device_id"],
         "feedback_type": "floor_update",
-        "heater_number": number,
-        "state": state,
-        "temp": temp,
+        "heater_number": feedback.heater_number,
+        "state": feedback.state,
+        "temp": feedback.temp,
     }
 
     try:
-        hass.bus.async_fire(str(info["device_id"]), event_data)
+        subscriptions.publish(hass, info["device_id"], event_data)
 
     except Exception as e:
         logging.error(f"error in firing event: {e}")
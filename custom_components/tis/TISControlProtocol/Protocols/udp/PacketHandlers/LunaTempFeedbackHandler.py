@@ -1,22 +1,29 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from TISControlProtocol.shared import subscriptions, with_raw_bytes
+from TISControlProtocol.Protocols.udp.PayloadCodec import CODECS
 import logging
 
 
-async def handle_luna_temp_feedback(hass: HomeAssistant, info: dict):
+@callback
+def handle_luna_temp_feedback(hass: HomeAssistant, info: dict):
     """
     Handle the feedback from a Luna temperature sensor.
     """
     device_id = info["device_id"]
-    temperature = int(info["additional_bytes"][1])
+    try:
+        temperature = CODECS[info.opcode].decode_frame(info.raw).temp
+    except ValueError as e:
+        logging.error(f"error in decoding temperature feedback: {e}")
+        return
 
     event_data = {
         "device_id": device_id,
         "feedback_type": "temp_feedback",
         "temp": temperature,
-        "additional_bytes": info["additional_bytes"],
     }
+    with_raw_bytes(event_data, info)
 
     try:
-        hass.bus.async_fire(str(info["device_id"]), event_data)
+        subscriptions.publish(hass, info["device_id"], event_data)
     except Exception as e:
         logging.error(f"error in firing event for feedback: {e}")
@@ -1,22 +1,24 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 import logging
 import asyncio
-from TISControlProtocol.shared import ack_events
+from TISControlProtocol.shared import ack_events, subscriptions, with_raw_bytes
 
 
-async def handle_real_time_feedback(hass: HomeAssistant, info: dict):
-    channel_number = info["additional_bytes"][0]
-    # await target_appliance.handle_packet(info["additional_bytes"], "control")
+@callback
+def handle_real_time_feedback(hass: HomeAssistant, info: dict):
+    payload = info.payload
+    channel_number = payload[0]
     if info["source_device_id"] == [0x64, 0x64]:
         event_data = {
             "device_id": info["device_id"],
             "channel_number": channel_number,
             "feedback_type": "realtime_feedback",
-            "additional_bytes": info["additional_bytes"],
+            "value": payload[1],
         }
+        with_raw_bytes(event_data, info)
         try:
-            hass.bus.async_fire(str(info["device_id"]), event_data)
+            subscriptions.publish(hass, info["device_id"], event_data, channel_number)
         except Exception as e:
             logging.error(f"error in firing event for feedback: {e}")
 
@@ -1,41 +1,34 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 import logging
 
-import asyncio
-from TISControlProtocol.shared import ack_events
+from TISControlProtocol.shared import resolve_ack, subscriptions, with_raw_bytes
 
 
 
-async def handle_security_feedback(hass: HomeAssistant, info: dict):
+@callback
+def handle_security_feedback(hass: HomeAssistant, info: dict):
     """
     Handle the feedback from a security sensor.
     """
-    channel_number = info["additional_bytes"][0]
-    mode = info["additional_bytes"][1]
+    payload = info.payload
+    channel_number = payload[0]
+    mode = payload[1]
     event_data = {
         "device_id": info["device_id"],
         "feedback_type": "security_feedback",
-        "additional_bytes": info["additional_bytes"],
         "channel_number": channel_number,
         "mode": mode,
     }
+    with_raw_bytes(event_data, info)
     try:
-        hass.bus.async_fire(str(info["device_id"]), event_data)
+        subscriptions.publish(hass, info["device_id"], event_data, channel_number)
         logging.info(
-            f"control response event fired for {info['device_id']}, additional bytes: {info['additional_bytes']}"
+            f"control response event fired for {info['device_id']}, channel: {channel_number}, mode: {mode}"
         )
     except Exception as e:
         logging.error(f"error in firing event for feedback security: {e}")
 
     try:
-        event: asyncio.Event = ack_events.get(
-            (
-                tuple(info["device_id"]),
-                (0x01, 0x04),
-                int(channel_number),
-            )
-        )
-        if event is not None:
-            event.set()
+        resolve_ack((tuple(info["device_id"]), (0x01, 0x04), int(channel_number)))
     except Exception as e:
-        logging.error(f"error in setting event for {info["device_id"]}: {e}")
+        logging.error(f"error in resolving ack for {info["device_id"]}: {e}")
@@ -1,17 +1,22 @@
-from homeassistant.core import HomeAssistant  # type: ignore
+from homeassistant.core import HomeAssistant, callback  # type: ignore
+from TISControlProtocol.shared import subscriptions, with_raw_bytes
 import logging
 
 
-async def handle_update_response(hass: HomeAssistant, info: dict):
-    # remove auxilary bytes which represents number of scenarios
-    channels_number = info["additional_bytes"][0]
+@callback
+def handle_update_response(hass: HomeAssistant, info: dict):
+    # first byte is the number of channels, then one value per channel
+    payload = info.payload
+    channels_number = payload[0]
     event_data = {
         "device_id": info["device_id"],
         "feedback_type": "update_response",
-        "additional_bytes": info["additional_bytes"],
         "channel_number": channels_number,
+        # value of channel n at index n - 1
+        "values": payload[1 : channels_number + 1].tolist(),
     }
+    with_raw_bytes(event_data, info)
     try:
-        hass.bus.async_fire(str(info["device_id"]), event_data)
+        subscriptions.publish(hass, info["device_id"], event_data)
     except Exception as e:
         logging.error(f"error in firing event: {e}")
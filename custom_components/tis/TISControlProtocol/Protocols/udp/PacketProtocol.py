@@ -2,8 +2,11 @@ from TISControlProtocol.BytesHelper import *  # noqa: F403
 from TISControlProtocol.Protocols.udp.PacketSender import PacketSender
 from TISControlProtocol.Protocols.udp.PacketReceiver import PacketReceiver
 from TISControlProtocol.Protocols.udp.AckCoordinator import AckCoordinator
+from TISControlProtocol.Protocols.udp.DiscoveryCache import DiscoveryCache
+from TISControlProtocol.Protocols.udp.UpdateCoordinator import UpdateCoordinator
+from TISControlProtocol.Protocols.udp.WarmupScheduler import WarmupScheduler
 
-from TISControlProtocol.shared import ack_events
+from TISControlProtocol.shared import ack_events, subscriptions
 
 from homeassistant.core import HomeAssistant  # type: ignore
 from .PacketHandlers.BinaryFeedbackHandler import handle_binary_feedback
@@ -68,6 +71,7 @@ class PacketProtocol:
         self.hass = hass
 
         self.ack_events = ack_events
+        self.subscriptions = subscriptions
         self.coordinator = AckCoordinator()
         self.sender = PacketSender(
             socket=self.socket,
@@ -75,7 +79,31 @@ class PacketProtocol:
             UDP_IP=self.UDP_IP,
             UDP_PORT=self.UDP_PORT,
         )
+        self.update_coordinator = UpdateCoordinator(self.hass, self.sender)
         self.receiver = PacketReceiver(self.socket, OPERATIONS_DICT, self.hass)
+        self.warmup = WarmupScheduler(self.hass, self.sender, self.receiver.dispatcher)
+        self.discovery = DiscoveryCache(self.hass, self.sender, self.receiver.dispatcher)
 
-        self.connection_made = self.receiver.connection_made
         self.datagram_received = self.receiver.datagram_received
+
+    def connection_made(self, transport):
+        self.receiver.connection_made(transport)
+        self.sender.outbound.transport = transport
+
+    def diagnostics(self) -> dict:
+        """Counters and latencies of the send and receive paths."""
+        outbound = self.sender.outbound
+        return {
+            "outbound": {
+                f"{ip}:{port}": dict(stats)
+                for (ip, port), stats in outbound.stats.items()
+            },
+            "queue_latency": outbound.latency(),
+            "ack_latency": self.sender.ack_latency(),
+            "ingress": {
+                **self.receiver.queue.stats,
+                "dropped": dict(self.receiver.queue.stats["dropped"]),
+            },
+            "warmup": dict(self.warmup.stats),
+            "pending_acks": sum(len(futures) for futures in self.ack_events.values()),
+        }
@@ -0,0 +1,174 @@
+"""Bounded ingress queue between PacketReceiver and PacketDispatcher."""
+
+from collections import deque
+from itertools import count
+import logging
+import time
+
+# PacketQueue.py
+NEVER_DROP = "never_drop"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+CLASS_CONTROL = "control"
+CLASS_POLL = "poll"
+CLASS_EVENT = "event"
+
+# responses that resolve a pending command (ack) or report a control change
+CONTROL_OPERATIONS = {
+    (0x00, 0x32),
+    (0xE0, 0xEF),
+    (0xE3, 0xD9),
+    (0x01, 0x05),
+    (0x01, 0x1F),
+}
+# answers to periodic state polls, superseded by the next poll anyway
+POLL_OPERATIONS = {
+    (0x00, 0x34),
+    (0xE0, 0xED),
+    (0x19, 0x45),
+    (0x20, 0x11),
+    (0x20, 0x21),
+    (0x20, 0x25),
+    (0xE3, 0xE8),
+    (0xEF, 0x01),
+}
+
+# Eviction order follows the order of this dict: when the queue is full the
+# oldest frame of the first DROP_OLDEST class that has one is dropped.
+DEFAULT_POLICIES = {
+    CLASS_POLL: DROP_OLDEST,
+    CLASS_EVENT: DROP_OLDEST,
+    CLASS_CONTROL: NEVER_DROP,
+}
+
+
+def classify(opcode: tuple) -> str:
+    if opcode in CONTROL_OPERATIONS:
+        return CLASS_CONTROL
+    if opcode in POLL_OPERATIONS:
+        return CLASS_POLL
+    return CLASS_EVENT
+
+
+class PacketQueue:
+    """
+    Bounded queue of parsed frames, drained in batches on the event loop.
+
+    Frames are kept in one deque per opcode class and drained in arrival
+    order. When ``maxsize`` frames are waiting, the overload policy of each
+    class decides what goes: ``drop_oldest`` classes give up their oldest
+    frame, ``drop_newest`` classes reject the incoming frame, and
+    ``never_drop`` frames (control acks) are always accepted.
+
+    :param loop: The event loop the queue is drained on.
+    :param dispatch: Callable invoked with each frame.
+    :param maxsize: Number of queued frames before the policies apply.
+    :param batch_size: Frames handled per loop iteration.
+    :param late_after: Seconds a frame may wait before it counts as late.
+    :param policies: Overrides for DEFAULT_POLICIES, keyed by class.
+    """
+
+    def __init__(
+        self,
+        loop,
+        dispatch,
+        maxsize: int = 1024,
+        batch_size: int = 64,
+        late_after: float = 1.0,
+        policies: dict | None = None,
+    ):
+        self.loop = loop
+        self.dispatch = dispatch
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.late_after = late_after
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self._queues = {name: deque() for name in self.policies}
+        self._evictable = [
+            (name, self._queues[name])
+            for name, policy in self.policies.items()
+            if policy == DROP_OLDEST
+        ]
+        self._sequence = count()
+        self._size = 0
+        self._scheduled = False
+        self._overloaded = False
+        self.stats = {
+            "received": 0,
+            "dispatched": 0,
+            "late": 0,
+            "max_depth": 0,
+            "dropped": {name: 0 for name in self.policies},
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, frame) -> bool:
+        """Queue a frame; returns False when the frame was dropped."""
+        self.stats["received"] += 1
+        packet_class = classify(frame.opcode)
+
+        if self._size >= self.maxsize and not self._make_room(packet_class):
+            self._count_drop(packet_class)
+            return False
+
+        self._queues[packet_class].append(
+            (next(self._sequence), time.monotonic(), frame)
+        )
+        self._size += 1
+        if self._size > self.stats["max_depth"]:
+            self.stats["max_depth"] = self._size
+        if not self._scheduled:
+            self._scheduled = True
+            self.loop.call_soon(self._drain)
+        return True
+
+    def _make_room(self, packet_class: str) -> bool:
+        if self.policies[packet_class] == DROP_NEWEST:
+            return False
+        for name, queue in self._evictable:
+            if queue:
+                queue.popleft()
+                self._size -= 1
+                self._count_drop(name)
+                return True
+        return self.policies[packet_class] == NEVER_DROP
+
+    def _count_drop(self, packet_class: str):
+        self.stats["dropped"][packet_class] += 1
+        if not self._overloaded:
+            self._overloaded = True
+            logging.warning(
+                f"TIS ingress queue full ({self.maxsize} frames), shedding load"
+            )
+
+    def _pop_oldest(self):
+        oldest = None
+        for queue in self._queues.values():
+            if queue and (oldest is None or queue[0][0] < oldest[0][0]):
+                oldest = queue
+        return oldest.popleft()
+
+    def _drain(self):
+        now = time.monotonic()
+        for _ in range(min(self.batch_size, self._size)):
+            _, queued_at, frame = self._pop_oldest()
+            self._size -= 1
+            if now - queued_at > self.late_after:
+                self.stats["late"] += 1
+            self.stats["dispatched"] += 1
+            self.dispatch(frame)
+
+        if self._size:
+            # yield to the loop between batches
+            self.loop.call_soon(self._drain)
+            return
+
+        self._scheduled = False
+        if self._overloaded:
+            self._overloaded = False
+            logging.warning(
+                f"TIS ingress queue drained, dropped so far: {self.stats['dropped']}"
+            )
@@ -1,7 +1,7 @@
-from TISControlProtocol.BytesHelper import *  # noqa: F403
 from socket import socket
 from TISControlProtocol.Protocols.udp.PacketExtractor import PacketExtractor
 from TISControlProtocol.Protocols.udp.PacketDispatcher import PacketDispatcher
+from TISControlProtocol.Protocols.udp.PacketQueue import PacketQueue
 import logging
 from homeassistant.core import HomeAssistant  # type: ignore
 
@@ -17,19 +17,21 @@ class PacketReceiver:
         self.socket = socket
         self._hass = hass
         self.dispatcher = PacketDispatcher(self._hass, OPERATIONS_DICT)
+        self.queue = PacketQueue(self._hass.loop, self.dispatcher.dispatch_packet)
         self.transport = None
-        self
 
     def connection_made(self, transport):
         self.transport = transport
         logging.info("connection made")
 
     def datagram_received(self, data, addr):
+        info = None
         try:
-            hex = bytes2hex(data, [])  # noqa: F405
-            info = PacketExtractor.extract_info(hex)
-            # dispatch the packet to the appropriate method according to the info
-            self._hass.async_create_task(self.dispatcher.dispatch_packet(info))
+            info = PacketExtractor.extract_info(data)
+            if info is None:
+                return
+            # queue the packet, it is dispatched in batches on the next loop turn
+            self.queue.put(info)
 
         except Exception as e:
             logging.error(f"Error in datagram_received: {e}, info: {info}")
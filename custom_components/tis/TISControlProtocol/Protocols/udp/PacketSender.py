@@ -1,7 +1,22 @@
 from socket import socket, SOL_SOCKET, SO_BROADCAST
 
 from TISControlProtocol.Protocols.udp.AckCoordinator import AckCoordinator
+from TISControlProtocol.Protocols.udp.OutboundQueue import (
+    LANES,
+    LATENCY_SAMPLES,
+    MAX_BURST,
+    MIN_GAP,
+    PRIORITY_CONTROL,
+    PRIORITY_DISCOVERY,
+    PRIORITY_POLL,
+    PRIORITY_RETRANSMIT,
+    OutboundQueue,
+    latency_summary,
+)
 import asyncio
+from functools import partial
+import random
+import time
 from TISControlProtocol.shared import ack_events  # noqa: F401
 from collections import deque
 from TISControlProtocol.Protocols.udp.ProtocolHandler import TISPacket
@@ -9,70 +24,238 @@ import logging
 
 
 # PacketSender.py
+# operation code -> index of the commanded value in the payload, for the
+# commands whose ack echoes it (control_response reports the new level)
+ACK_VALUE_BYTES = {(0x00, 0x31): 1}
+
+
 class PacketSender:
-    def __init__(self, socket: socket, coordinator: AckCoordinator, UDP_IP, UDP_PORT):
+    def __init__(
+        self,
+        socket: socket,
+        coordinator: AckCoordinator,
+        UDP_IP,
+        UDP_PORT,
+        max_in_flight: int = 8,
+        min_gap: float = MIN_GAP,
+        max_burst: int = MAX_BURST,
+    ):
         self.UDP_IP = UDP_IP
         self.UDP_PORT = UDP_PORT
         self.socket = socket
         self.socket.setsockopt(SOL_SOCKET, SO_BROADCAST, 1)
         self.coordinator = coordinator
-        self.command_stacks = {}  # Holds the command stacks
-        self.last_command_times = {}  # Holds the last command times for debouncing
+        # paced per gateway, the transport is attached in connection_made
+        self.outbound = OutboundQueue(min_gap=min_gap, max_burst=max_burst)
+        self.pending_commands = {}  # unique ids -> [newest waiting packets, shared future]
+        self.command_drivers = {}  # unique ids -> task sending their commands in order
+        self.max_in_flight = max_in_flight  # commands waiting for an ack, per gateway
+        self.in_flight = {}  # gateway ip -> asyncio.Semaphore
+        # lane of the acked transmission -> seconds from its send to the ack
+        self.ack_latencies = {
+            lane: deque(maxlen=LATENCY_SAMPLES)
+            for lane in (PRIORITY_CONTROL, PRIORITY_RETRANSMIT)
+        }
         self.update_packet_queue = deque()  # holds update packets
         self.update_device_queue = set()  # holds update device ids
 
-    async def send_packet(self, packet: TISPacket):
-        logging.info(f"sending {packet}")
-        self.socket.sendto(packet.__bytes__(), (packet.destination_ip, self.UDP_PORT))
+    async def send_packet(self, packet: TISPacket, priority: int = PRIORITY_POLL):
+        logging.info("sending %s", packet)
+        sent = self.outbound.send(
+            packet.__bytes__(), (packet.destination_ip, self.UDP_PORT), priority
+        )
+        if sent is not None:
+            await sent
+
+    def ack_latency(self) -> dict:
+        """
+        p50/p99 command latency in seconds and sample count per lane.
+
+        A sample is the time from handing a command to the outbound queue
+        until its ack resolved, filed under the lane of that transmission:
+        ``control`` for acks of the first send, ``retransmit`` for the rest.
+        """
+        return {
+            LANES[lane]: latency_summary(samples)
+            for lane, samples in self.ack_latencies.items()
+        }
+
+    def _acked(self, sent_at: dict, unique_id: tuple, ack: asyncio.Future):
+        if not ack.cancelled():
+            sent, priority = sent_at[unique_id]
+            self.ack_latencies[priority].append(time.monotonic() - sent)
+
+    def _gateway_slots(self, destination_ip: str) -> asyncio.Semaphore:
+        slots = self.in_flight.get(destination_ip)
+        if slots is None:
+            slots = self.in_flight[destination_ip] = asyncio.Semaphore(
+                self.max_in_flight
+            )
+        return slots
 
     async def send_packet_with_ack(
         self,
         packet: TISPacket,
-        attempts: int = 15,
-        timeout: float = 1,
-        debounce_time: float = 0.1,  # The debounce time in seconds
+        attempts: int = 6,
+        timeout: float = 0.5,
+        max_timeout: float = 4,
+        jitter: float = 0.2,
     ):
-        unique_id = (
+        """
+        Send a command and retransmit it until its ack arrives.
+
+        Commands are coalesced per (device, operation code, channel): while
+        one is in flight only the newest pending command is kept, and it is
+        sent as soon as the previous one is acked or its current wait runs
+        out. Callers whose command was superseded get the outcome of the
+        command that replaced it, so a slider drag ends on its last value.
+
+        The wait for the ack starts at ``timeout`` and doubles after every
+        attempt up to ``max_timeout``, each wait randomised by ``jitter``
+        so retries from many entities do not line up. At most
+        ``max_in_flight`` commands per gateway wait for an ack at a time.
+
+        :param packet: The command packet.
+        :param attempts: Number of transmissions before giving up.
+        :param timeout: Seconds to wait for the ack after the first send.
+        :param max_timeout: Upper bound for the wait between retries.
+        :param jitter: Relative random spread applied to every wait.
+        :return: True if the command (or the one that replaced it) was acked.
+        """
+        return await self._send_coalesced(
+            (self._ack_id(packet),), (packet,), attempts, timeout, max_timeout, jitter
+        )
+
+    async def send_packets_with_ack(
+        self,
+        packets,
+        attempts: int = 6,
+        timeout: float = 0.5,
+        max_timeout: float = 4,
+        jitter: float = 0.2,
+    ):
+        """
+        Send the frames of a multi-channel command as one burst.
+
+        All frames go out back to back and their acks are awaited together;
+        retries resend only the channels that are still missing. The set is
+        coalesced like a single command, keyed by all of its channels.
+
+        :param packets: The command packets, one per channel.
+        :return: True once every channel has acked.
+        """
+        unique_ids = tuple(self._ack_id(packet) for packet in packets)
+        return await self._send_coalesced(
+            unique_ids, tuple(packets), attempts, timeout, max_timeout, jitter
+        )
+
+    @staticmethod
+    def _ack_id(packet: TISPacket) -> tuple:
+        return (
             tuple(packet.device_id),
             tuple(packet.operation_code),
             int(packet.additional_bytes[0]),
         )
 
-        # Add the command to the stack for this unique ID
-        if unique_id not in self.command_stacks:
-            self.command_stacks[unique_id] = []
-        self.command_stacks[unique_id].append(packet)
+    @staticmethod
+    def _ack_value(packet: TISPacket) -> int | None:
+        index = ACK_VALUE_BYTES.get(tuple(packet.operation_code))
+        if index is None or len(packet.additional_bytes) <= index:
+            return None
+        return int(packet.additional_bytes[index])
 
-        # Only process the last command in the stack
-        if packet != self.command_stacks[unique_id][-1]:
-            return
+    async def _send_coalesced(self, unique_ids, packets, *retry):
+        pending = self.pending_commands.get(unique_ids)
+        if pending is not None:
+            # latest wins: replace the waiting command, share its outcome
+            pending[0] = packets
+            return await asyncio.shield(pending[1])
 
-        # If the command is being called too quickly after the last one, ignore it
-        if (
-            unique_id in self.last_command_times
-            and asyncio.get_event_loop().time() - self.last_command_times[unique_id]
-            < debounce_time
-        ):
-            return
+        loop = asyncio.get_running_loop()
+        pending = self.pending_commands[unique_ids] = [packets, loop.create_future()]
+        if unique_ids not in self.command_drivers:
+            self.command_drivers[unique_ids] = loop.create_task(
+                self._drive_commands(unique_ids, *retry)
+            )
+        return await asyncio.shield(pending[1])
 
-        self.last_command_times[unique_id] = asyncio.get_event_loop().time()
+    async def _drive_commands(self, unique_ids, *retry):
+        superseded = []
+        try:
+            while (pending := self.pending_commands.pop(unique_ids, None)) is not None:
+                packets, result = pending
+                try:
+                    acked = await self._transmit(unique_ids, packets, *retry)
+                except Exception as e:
+                    logging.error(f"error sending {packets}: {e}")
+                    acked = False
 
-        event = self.coordinator.create_ack_event(unique_id)
+                if acked is None:
+                    # a newer command is waiting, it decides the outcome
+                    superseded.append(result)
+                    continue
+                for future in (*superseded, result):
+                    if not future.done():
+                        future.set_result(acked)
+                superseded.clear()
+        finally:
+            del self.command_drivers[unique_ids]
+            for future in superseded:
+                if not future.done():
+                    future.set_result(False)
 
-        for attempt in range(attempts):
-            await self.send_packet(packet)
+    async def _transmit(self, unique_ids, packets, attempts, timeout, max_timeout, jitter):
+        async with self._gateway_slots(packets[0].destination_ip):
+            acks = {
+                unique_id: self.coordinator.create_ack_future(
+                    unique_id, self._ack_value(packet)
+                )
+                for unique_id, packet in zip(unique_ids, packets)
+            }
+            missing = dict(zip(unique_ids, packets))
+            sent_at = {}  # unique id -> (send time, lane) of its last transmission
+            for unique_id, ack in acks.items():
+                ack.add_done_callback(partial(self._acked, sent_at, unique_id))
             try:
-                await asyncio.wait_for(event.wait(), timeout)
-                # Remove the command from the stack after it's processed
-                self.command_stacks[unique_id].remove(packet)
-                return True
-            except asyncio.TimeoutError:
-                logging.info(f"ack not received within {timeout} seconds")
-
-        self.coordinator.remove_ack_event(unique_id)
+                wait = timeout
+                for attempt in range(attempts):
+                    priority = PRIORITY_CONTROL if attempt == 0 else PRIORITY_RETRANSMIT
+                    for unique_id, packet in missing.items():
+                        sent_at[unique_id] = (time.monotonic(), priority)
+                        await self.send_packet(packet, priority)
+                    await asyncio.wait(
+                        [acks[unique_id] for unique_id in missing],
+                        timeout=wait * random.uniform(1 - jitter, 1 + jitter),
+                    )
+                    missing = {
+                        unique_id: packet
+                        for unique_id, packet in missing.items()
+                        if not acks[unique_id].done()
+                    }
+                    if not missing:
+                        return True
+                    logging.info(
+                        f"ack not received within {wait} seconds for "
+                        f"{len(missing)} of {len(packets)} frames, attempt {attempt + 1}"
+                    )
+                    if unique_ids in self.pending_commands:
+                        logging.info(f"command for {unique_ids} superseded")
+                        return None
+                    wait = min(wait * 2, max_timeout)
+            finally:
+                for unique_id, ack in acks.items():
+                    self.coordinator.remove_ack_future(unique_id, ack)
+                    ack.cancel()
+
         logging.info(f"ack not received after {attempts} attempts")
         return False
 
-    async def broadcast_packet(self, packet: TISPacket):
-        logging.info(f"broadcasting {packet}")
-        self.socket.sendto(packet.__bytes__(), ("<broadcast>", self.UDP_PORT))
+    async def broadcast_packet(
+        self, packet: TISPacket, priority: int = PRIORITY_DISCOVERY
+    ):
+        logging.info("broadcasting %s", packet)
+        sent = self.outbound.send(
+            packet.__bytes__(), ("<broadcast>", self.UDP_PORT), priority
+        )
+        if sent is not None:
+            await sent
@@ -0,0 +1,73 @@
+"""Precompiled frame prefixes for outgoing packets."""
+
+from TISControlProtocol.crc import CRC_OFFSET, CRCState
+
+# PacketTemplate.py
+LENGTH_OFFSET = 16
+SOURCE_DEVICE_ID = (0x01, 0xFE)
+HEADER = b"SMARTCLOUD"
+
+
+class PacketTemplate:
+    """
+    Fixed part of a frame for one (source ip, device id, operation code).
+
+    The prefix (ip, header, lead code, ids and opcode) is encoded once;
+    building a packet only patches the length byte, appends the payload
+    and the CRC. The CRC over the prefix is kept per payload length, so
+    a packet only runs the CRC table over its payload bytes.
+
+    :param source_ip: Source IP address as a string.
+    :param device_id: List of integers representing the target device ID.
+    :param operation_code: List of integers representing the operation code.
+    """
+
+    __slots__ = ("_prefix", "_crc_states")
+
+    def __init__(self, source_ip: str, device_id, operation_code):
+        prefix = bytearray(int(part) for part in source_ip.split("."))
+        prefix += HEADER
+        prefix += b"\xaa\xaa"
+        prefix.append(0)  # length, patched per packet
+        prefix.extend(SOURCE_DEVICE_ID)
+        prefix += b"\xff\xfe"
+        prefix.extend(operation_code)
+        prefix.extend(device_id)
+        self._prefix = prefix
+        self._crc_states: dict[int, CRCState] = {}
+
+    def _crc_state(self, length: int) -> CRCState:
+        state = self._crc_states.get(length)
+        if state is None:
+            prefix = bytearray(self._prefix)
+            prefix[LENGTH_OFFSET] = length
+            state = self._crc_states[length] = CRCState(
+                memoryview(prefix)[CRC_OFFSET:]
+            )
+        return state
+
+    def build(self, payload) -> bytes:
+        """Return the complete wire bytes for ``payload``."""
+        length = 11 + len(payload)
+        frame = bytearray(self._prefix)
+        frame[LENGTH_OFFSET] = length
+        frame.extend(payload)
+        crc = self._crc_state(length).resume(payload)
+        frame.append(crc >> 8)
+        frame.append(crc & 0xFF)
+        return bytes(frame)
+
+
+# The destination gateway is not part of the frame, so it is left out of the
+# key: the same template serves a device regardless of which gateway routes it.
+_templates: dict[tuple, PacketTemplate] = {}
+
+
+def get_template(source_ip: str, device_id, operation_code) -> PacketTemplate:
+    key = (source_ip, tuple(device_id), tuple(operation_code))
+    template = _templates.get(key)
+    if template is None:
+        template = _templates[key] = PacketTemplate(
+            source_ip, device_id, operation_code
+        )
+    return template
@@ -0,0 +1,288 @@
+from collections import namedtuple
+import struct
+from typing import NamedTuple
+
+from TISControlProtocol.Protocols.udp.PacketFrame import (
+    MIN_FRAME_LENGTH,
+    PAYLOAD_OFFSET,
+)
+
+# PayloadCodec.py
+_CODES = {
+    ("uint", 1): "B",
+    ("uint", 2): "H",
+    ("uint", 4): "I",
+    ("int", 1): "b",
+    ("int", 2): "h",
+    ("int", 4): "i",
+    ("float", 4): "f",
+}
+
+
+def _slot_key(field) -> tuple:
+    # single bytes have no byte order, they join the big endian group
+    return (field.offset, field.width, field.kind, field.big_endian or field.width == 1)
+
+
+class PayloadError(ValueError):
+    """Raised when a payload is too short for its layout."""
+
+
+class Field(NamedTuple):
+    """
+    One value of a payload layout.
+
+    :param name: Name of the value in the decoded result.
+    :param offset: Byte offset in the payload (the additional bytes).
+    :param width: Size in bytes: 1, 2 or 4.
+    :param kind: ``"uint"``, ``"int"`` or ``"float"`` (4 bytes).
+    :param big_endian: Byte order of multi-byte values.
+    :param scale: Factor applied to the raw value.
+    :param shift: Right shift applied to the raw value, for bit fields.
+    :param mask: Mask applied after the shift, for bit fields.
+    :param default: Value used when the payload ends before the field;
+        only fields past the codec's ``min_length`` can use it.
+    """
+
+    name: str
+    offset: int
+    width: int = 1
+    kind: str = "uint"
+    big_endian: bool = True
+    scale: float = 1
+    shift: int = 0
+    mask: int | None = None
+    default: object = None
+
+
+class PayloadCodec:
+    """
+    Decoder compiled once from a declarative payload layout.
+
+    The fields are grouped by byte order and each group becomes a single
+    ``struct.Struct`` (gaps are padding), so a full payload is decoded
+    with one ``unpack_from`` per byte order. Bit fields that share a byte
+    (e.g. the AC mode and fan nibbles) read the same unpacked value.
+    ``decode(payload)`` takes a bytes-like payload (e.g. ``info.payload``)
+    and ``decode_frame(data)`` a whole frame (``info.raw``); both return a
+    namedtuple with the field names.
+
+    A payload shorter than ``min_length`` raises PayloadError. Payloads
+    between ``min_length`` and the full layout size decode the fields
+    they contain and use the defaults for the others; without
+    ``trust_partial`` they only decode the fields within ``min_length``.
+
+    :param name: Name of the result type.
+    :param fields: The fields of the layout.
+    :param min_length: Shortest acceptable payload, the full layout size
+        if not given.
+    :param trust_partial: Decode the fields a partial payload contains;
+        if false, every field past ``min_length`` takes its default.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields,
+        min_length: int | None = None,
+        trust_partial: bool = True,
+    ):
+        self.name = name
+        self.trust_partial = trust_partial
+        self.fields = tuple(fields)
+        self.result_type = namedtuple(name, [field.name for field in self.fields])
+
+        # one slot per distinct value to unpack
+        slots = set()
+        for field in self.fields:
+            if (field.kind, field.width) not in _CODES:
+                raise ValueError(
+                    f"{name}.{field.name}: unsupported {field.kind}{field.width * 8}"
+                )
+            slots.add(_slot_key(field))
+
+        self._groups = []
+        self._slot_structs = []
+        index = {}
+        for big_endian in (True, False):
+            group = sorted(key for key in slots if key[3] is big_endian)
+            if not group:
+                continue
+            order = ">" if big_endian else "<"
+            start = position = group[0][0]
+            layout = order
+            for offset, width, kind, _ in group:
+                if offset < position:
+                    raise ValueError(f"{name}: overlapping fields at offset {offset}")
+                if offset > position:
+                    layout += f"{offset - position}x"
+                layout += _CODES[(kind, width)]
+                position = offset + width
+                index[(offset, width, kind, big_endian)] = len(index)
+                self._slot_structs.append(
+                    (offset, struct.Struct(order + _CODES[(kind, width)]))
+                )
+            self._groups.append((start, struct.Struct(layout)))
+
+        self.size = max(field.offset + field.width for field in self.fields)
+        self.min_length = self.size if min_length is None else min_length
+        for field in self.fields:
+            if field.offset + field.width > self.min_length and field.default is None:
+                raise ValueError(
+                    f"{name}.{field.name}: needs a default past min_length"
+                )
+        self._transforms = tuple(
+            (index[_slot_key(field)], field.shift, field.mask, field.scale)
+            for field in self.fields
+        )
+
+    def decode(self, payload):
+        """
+        Decode a bytes-like payload (e.g. ``info.payload``).
+
+        :raises PayloadError: If the payload is shorter than ``min_length``.
+        """
+        if len(payload) < self.size:
+            return self._decode_partial(payload)
+        return self._decode_full(payload, 0)
+
+    def decode_frame(self, data):
+        """
+        Decode the payload of a whole frame (``info.raw``) in place.
+
+        :raises PayloadError: If the payload is shorter than ``min_length``.
+        """
+        if len(data) < self.size + MIN_FRAME_LENGTH:
+            return self._decode_partial(memoryview(data)[PAYLOAD_OFFSET:-2])
+        return self._decode_full(data, PAYLOAD_OFFSET)
+
+    def _decode_full(self, data, base: int):
+        values = []
+        for start, layout in self._groups:
+            values += layout.unpack_from(data, base + start)
+        transform = self._transform
+        return self.result_type._make(
+            [
+                transform(values[slot], shift, mask, scale)
+                for slot, shift, mask, scale in self._transforms
+            ]
+        )
+
+    def _decode_partial(self, payload):
+        length = len(payload)
+        if length < self.min_length:
+            raise PayloadError(
+                f"{self.name}: payload of {length} bytes, expected {self.min_length}"
+            )
+        if not self.trust_partial:
+            length = self.min_length
+        values = [
+            slot.unpack_from(payload, offset)[0]
+            if offset + slot.size <= length
+            else None
+            for offset, slot in self._slot_structs
+        ]
+        return self.result_type._make(
+            [
+                field.default
+                if values[slot] is None
+                else self._transform(values[slot], shift, mask, scale)
+                for field, (slot, shift, mask, scale) in zip(
+                    self.fields, self._transforms
+                )
+            ]
+        )
+
+    @staticmethod
+    def _transform(value, shift, mask, scale):
+        if shift:
+            value >>= shift
+        if mask is not None:
+            value &= mask
+        if scale != 1:
+            value *= scale
+        return value
+
+
+# operation code -> codec of its payload
+CODECS: dict[tuple, PayloadCodec] = {}
+
+
+def register_codec(operation_codes, codec: PayloadCodec) -> PayloadCodec:
+    """Register ``codec`` for one or more operation codes."""
+    if isinstance(operation_codes[0], int):
+        operation_codes = (operation_codes,)
+    for operation_code in operation_codes:
+        CODECS[tuple(operation_code)] = codec
+    return codec
+
+
+register_codec(
+    [(0xE0, 0xED), (0xE0, 0xEF)],
+    PayloadCodec(
+        "ClimateControlFeedback",
+        [
+            Field("ac_number", 1),
+            Field("state", 2),
+            Field("cool_temp", 3),
+            Field("hvac_mode", 4, shift=4, mask=0x0F),
+            Field("fan_speed", 4, mask=0x0F),
+            Field("heat_temp", 7),
+            Field("auto_temp", 9),
+        ],
+    ),
+)
+
+register_codec(
+    (0x19, 0x45),
+    PayloadCodec(
+        "FloorBinaryFeedback",
+        [Field("heater_number", 0), Field("state", 3), Field("temp", 5)],
+    ),
+)
+
+register_codec(
+    (0xE3, 0xE8),
+    PayloadCodec("LunaTempFeedback", [Field("temp", 1)]),
+)
+
+# 10F sensors only send lux: any payload shorter than the full layout
+# reports lux alone and 0 for the other readings;
+# eco2/tvoc/co states: 0 not ready, 1 excellent, 2 normal, 3-5 low to high risk
+register_codec(
+    (0x20, 0x25),
+    PayloadCodec(
+        "HealthFeedback",
+        [
+            Field("lux", 5, 2),
+            Field("noise", 7, 2, default=0),
+            Field("eco2", 9, 2, default=0),
+            Field("tvoc", 11, 2, default=0),
+            Field("temp", 13, default=0),
+            Field("humidity", 14, default=0),
+            Field("co", 27, 2, default=0),
+            Field("eco2_state", 31, default=0),
+            Field("tvoc_state", 32, default=0),
+            Field("co_state", 33, default=0),
+        ],
+        min_length=7,
+        trust_partial=False,
+    ),
+)
+
+register_codec(
+    (0x20, 0x21),
+    PayloadCodec(
+        "WeatherFeedback",
+        [
+            Field("wind", 3),
+            Field("temperature", 4, 4, "float"),
+            Field("humidity", 8),
+            Field("wind_speed", 9, 4, "float"),
+            Field("gust_speed", 13, 4, "float"),
+            Field("rainfall", 17, 2),
+            Field("lighting", 19, 4, "float"),
+            Field("uv", 23),
+        ],
+    ),
+)
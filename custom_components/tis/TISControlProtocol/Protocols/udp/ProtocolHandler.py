@@ -1,6 +1,6 @@
 """Class for handling the UDP protocol"""
 
-from ...BytesHelper import build_packet
+from .PacketTemplate import get_template
 from typing import List, Literal, Tuple
 
 
@@ -8,6 +8,9 @@ class TISPacket:
     """
     Class representing a Packet.
 
+    The wire bytes are built once from a cached template and reused on
+    every send.
+
     :param device_id: List of integers representing the device ID.
     :param operation_code: List of integers representing the operation code.
     :param source_ip: Source IP address as a string.
@@ -30,21 +33,18 @@ class TISPacket:
         self.source_ip = source_ip
         self.destination_ip = destination_ip
         self.additional_bytes = additional_bytes
-        self._packet = build_packet(
-            ip_address=self.source_ip,
-            device_id=self.device_id,
-            operation_code=self.operation_code,
-            additional_packets=self.additional_bytes,
-        )
+        self._packet = get_template(
+            self.source_ip, self.device_id, self.operation_code
+        ).build(self.additional_bytes)
 
     def __str__(self) -> str:
-        return f"Packet: {self._packet}"
+        return f"Packet: {list(self._packet)}"
 
     def __repr__(self) -> str:
-        return f"Packet: {self._packet}"
+        return f"Packet: {list(self._packet)}"
 
     def __bytes__(self) -> bytes:
-        return bytes(self._packet)
+        return self._packet
 
 
 class TISProtocolHandler:
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+
+# TokenBucket.py
+class TokenBucket:
+    """
+    Token bucket rate limiter for outgoing frames.
+
+    Up to ``burst`` frames may go out back to back, after which frames are
+    released at ``rate`` per second.
+
+    :param rate: Tokens added per second.
+    :param burst: Bucket capacity.
+    """
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated")
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting."""
+        if self._refill() >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def delay(self) -> float:
+        """Seconds until the next token is available."""
+        return max(0.0, (1 - self._refill()) / self.rate)
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        while not self.try_acquire():
+            await asyncio.sleep(self.delay())
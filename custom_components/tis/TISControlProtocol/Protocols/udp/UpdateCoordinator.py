@@ -1,2 +1,92 @@
+from datetime import timedelta
+import logging
+
+from homeassistant.core import HomeAssistant  # type: ignore
+from homeassistant.helpers.event import async_track_time_interval  # type: ignore
+
+from TISControlProtocol.Protocols.udp.PacketSender import PacketSender
+from TISControlProtocol.Protocols.udp.ProtocolHandler import TISPacket
+
+# UpdateCoordinator.py
+POLLING_INTERVAL = timedelta(seconds=60)
+
+
 class UpdateCoordinator:
-    pass
\ No newline at end of file
+    """
+    Shared state poller for update requests.
+
+    Entities register the update packet they want polled while their state
+    is unknown. Packets with the same destination and wire bytes are sent
+    once per interval no matter how many entities asked for them: every
+    channel of a relay shares one OPERATION_CONTROL_UPDATE request, and the
+    0x0034 response reaches all of its channel entities through the
+    subscription registry. A single timer serves all devices and only runs
+    while something is registered.
+
+    :param hass: The Home Assistant instance.
+    :param sender: The PacketSender used to send update packets.
+    :param interval: Time between two polls.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        sender: PacketSender,
+        interval: timedelta = POLLING_INTERVAL,
+    ):
+        self.hass = hass
+        self.sender = sender
+        self.interval = interval
+        # (destination_ip, wire bytes) -> (packet, owners)
+        self._polls: dict[tuple, tuple[TISPacket, set]] = {}
+        self._unsub = None
+
+    @staticmethod
+    def _key(packet: TISPacket) -> tuple:
+        return (packet.destination_ip, bytes(packet))
+
+    def start_polling(self, owner, packet: TISPacket) -> bool:
+        """
+        Poll ``packet`` on behalf of ``owner`` until it calls stop_polling.
+
+        :return: True if ``owner`` was not already polling this packet.
+        """
+        _, owners = self._polls.setdefault(self._key(packet), (packet, set()))
+        if owner in owners:
+            return False
+        owners.add(owner)
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_poll, self.interval
+            )
+        return True
+
+    def stop_polling(self, owner, packet: TISPacket) -> bool:
+        """
+        Remove ``owner`` from the packet's pollers.
+
+        :return: True if ``owner`` was polling this packet.
+        """
+        key = self._key(packet)
+        poll = self._polls.get(key)
+        if poll is None or owner not in poll[1]:
+            return False
+        poll[1].discard(owner)
+        if not poll[1]:
+            del self._polls[key]
+        if not self._polls and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        return True
+
+    async def _async_poll(self, now=None):
+        polls = list(self._polls.values())
+        logging.info(
+            f"polling {len(polls)} devices for "
+            f"{sum(len(owners) for _, owners in polls)} entities"
+        )
+        for packet, _ in polls:
+            try:
+                await self.sender.send_packet(packet)
+            except Exception as e:
+                logging.error(f"error sending update packet {packet}: {e}")
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant  # type: ignore
+
+from TISControlProtocol.Protocols.udp.PacketDispatcher import PacketDispatcher
+from TISControlProtocol.Protocols.udp.PacketSender import PacketSender
+from TISControlProtocol.Protocols.udp.OutboundQueue import PRIORITY_POLL
+from TISControlProtocol.Protocols.udp.ProtocolHandler import TISPacket
+
+# WarmupScheduler.py
+COLLECT_DELAY = 0.5
+ANSWER_TIMEOUT = 2.0
+ATTEMPTS = 3
+
+# request operation code -> (request byte, answer byte) pairs naming the
+# unit (AC, heater, channel) a device answers for, on devices with several
+UNIT_BYTES = {
+    (0xE0, 0xEC): ((0, 1),),  # AC update, AC number
+    (0x19, 0x44): ((0, 0),),  # floor heating update, heater number
+    (0x01, 0x1E): ((0, 0),),  # security update, channel
+    (0x20, 0x10): ((0, 0), (1, 1)),  # energy update, channel and report
+}
+
+
+def _answer_code(operation_code) -> tuple:
+    code = ((operation_code[0] << 8) | operation_code[1]) + 1
+    return ((code >> 8) & 0xFF, code & 0xFF)
+
+
+# answer operation code -> payload bytes naming the unit
+ANSWER_UNIT_BYTES = {
+    _answer_code(code): tuple(answer for _, answer in pairs)
+    for code, pairs in UNIT_BYTES.items()
+}
+
+
+def response_key(device_id, operation_code, additional_bytes=()) -> tuple:
+    """
+    Key of the frame that answers a request.
+
+    The answer comes from the addressed device with the request operation
+    code + 1 (0x0033 -> 0x0034, 0xE0EC -> 0xE0ED, ...). For requests listed
+    in UNIT_BYTES the key also holds the unit the request asks for, so the
+    answer for one AC or heater does not count for the others.
+    """
+    unit = tuple(
+        additional_bytes[request]
+        for request, _ in UNIT_BYTES.get(tuple(operation_code), ())
+    )
+    return (tuple(device_id), _answer_code(operation_code), unit)
+
+
+def answer_key(info) -> tuple:
+    """Key of a received frame, matching ``response_key`` of its request."""
+    unit_bytes = ANSWER_UNIT_BYTES.get(info.opcode, ())
+    payload = info.payload
+    if unit_bytes and len(payload) <= max(unit_bytes):
+        return (info.device_key, info.opcode, None)
+    return (info.device_key, info.opcode, tuple(payload[i] for i in unit_bytes))
+
+
+class WarmupScheduler:
+    """
+    Collects the initial state requests of entities and sends them paced.
+
+    Requests made within ``collect_delay`` of the first one form a round.
+    Identical packets (same destination and wire bytes) are sent once on
+    the sender's poll lane, which paces them with its per-gateway token
+    bucket, and only the requests that got no answer within
+    ``answer_timeout`` are sent again, up to ``attempts`` times. Answers
+    are recognised by watching the dispatcher for the response operation
+    code from the addressed device and, for multi-unit devices, the unit
+    in its payload.
+
+    :param hass: The Home Assistant instance.
+    :param sender: The PacketSender used to send the requests.
+    :param dispatcher: The PacketDispatcher whose frames answer requests.
+    :param collect_delay: Seconds to collect requests before a round starts.
+    :param answer_timeout: Seconds to wait for answers before retrying.
+    :param attempts: Times an unanswered request is sent.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        sender: PacketSender,
+        dispatcher: PacketDispatcher,
+        collect_delay: float = COLLECT_DELAY,
+        answer_timeout: float = ANSWER_TIMEOUT,
+        attempts: int = ATTEMPTS,
+    ):
+        self.hass = hass
+        self.sender = sender
+        self.dispatcher = dispatcher
+        self.collect_delay = collect_delay
+        self.answer_timeout = answer_timeout
+        self.attempts = attempts
+        self._queued: dict[tuple, TISPacket] = {}
+        self._in_flight: set = set()
+        # response key -> request keys it answers
+        self._waiting: dict[tuple, set] = {}
+        self._unanswered: set = set()
+        self._answered = asyncio.Event()
+        self._handle = None
+        self._task = None
+        self.stats = {"requested": 0, "duplicates": 0, "sent": 0, "unanswered": 0}
+
+    def request(self, packet: TISPacket):
+        """Queue an initial state request; it is sent with the next round."""
+        self.stats["requested"] += 1
+        key = (packet.destination_ip, bytes(packet))
+        if key in self._queued or key in self._in_flight:
+            self.stats["duplicates"] += 1
+            return
+        self._queued[key] = packet
+        if self._task is None and self._handle is None:
+            self._handle = self.hass.loop.call_later(self.collect_delay, self._start)
+
+    def _start(self):
+        self._handle = None
+        self._task = self.hass.async_create_task(self._run())
+
+    async def _run(self):
+        started = time.monotonic()
+        sent_before = self.stats["sent"]
+        requested = 0
+        unanswered = set()
+        try:
+            while self._queued:
+                batch, self._queued = self._queued, {}
+                requested += len(batch)
+                unanswered |= await self._warm(batch)
+        except Exception as e:
+            logging.error(f"error in warm-up: {e}")
+        finally:
+            self._task = None
+        self.stats["unanswered"] += len(unanswered)
+        logging.info(
+            f"warm-up finished in {time.monotonic() - started:.2f}s: "
+            f"{requested} requests, {self.stats['sent'] - sent_before} frames sent, "
+            f"{len(unanswered)} unanswered"
+        )
+
+    async def _warm(self, batch: dict) -> set:
+        self._in_flight = set(batch)
+        self._unanswered = set(batch)
+        self._answered.clear()
+        for key, packet in batch.items():
+            self._waiting.setdefault(
+                response_key(
+                    packet.device_id, packet.operation_code, packet.additional_bytes
+                ),
+                set(),
+            ).add(key)
+
+        self.dispatcher.observers.append(self._observe)
+        try:
+            for _ in range(self.attempts):
+                await asyncio.gather(
+                    *(self._send(batch[key]) for key in self._unanswered)
+                )
+                try:
+                    await asyncio.wait_for(self._answered.wait(), self.answer_timeout)
+                    break
+                except asyncio.TimeoutError:
+                    logging.info(f"warm-up: {len(self._unanswered)} requests unanswered")
+            return set(self._unanswered)
+        finally:
+            self.dispatcher.observers.remove(self._observe)
+            self._waiting.clear()
+            self._in_flight = set()
+
+    async def _send(self, packet: TISPacket):
+        await self.sender.send_packet(packet, PRIORITY_POLL)
+        self.stats["sent"] += 1
+
+    def _observe(self, info):
+        keys = self._waiting.pop(answer_key(info), None)
+        if keys:
+            self._unanswered -= keys
+            if not self._unanswered:
+                self._answered.set()
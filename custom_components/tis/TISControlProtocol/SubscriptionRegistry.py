@@ -0,0 +1,104 @@
+"""Direct callbacks from packet handlers to the entities a frame concerns."""
+
+import asyncio
+import logging
+from typing import Callable, Iterable
+
+from homeassistant.core import HomeAssistant  # type: ignore
+
+
+class SubscriptionRegistry:
+    """
+    Index of entity callbacks keyed by (device id, feedback type, channel).
+
+    Handlers publish the event data they used to fire on the bus; only the
+    callbacks registered for that device and feedback type are invoked. A
+    publish that names a channel reaches the subscribers of that channel
+    plus the device-wide (``channel=None``) subscribers; a publish without
+    a channel (a frame that carries every channel) reaches all of them.
+
+    When ``mirror_to_bus`` is set, every published event is also fired on
+    the Home Assistant bus under ``str(device_id)`` so automations and
+    bus listeners keep receiving it. The platforms only use subscriptions,
+    so the mirror can be turned off without affecting any entity.
+
+    :param mirror_to_bus: Fire published events on the bus as well.
+    """
+
+    def __init__(self, mirror_to_bus: bool = True):
+        self.mirror_to_bus = mirror_to_bus
+        # (device_id, feedback_type) -> {channel: [(callback, is_coroutine)]}
+        self._subscriptions: dict[tuple, dict] = {}
+
+    def subscribe(
+        self,
+        device_id,
+        feedback_types: str | Iterable[str],
+        callback: Callable,
+        channel: int | None = None,
+    ) -> Callable[[], None]:
+        """
+        Register ``callback`` for a device and one or more feedback types.
+
+        :param device_id: Device id as a list or tuple, e.g. ``[1, 10]``.
+        :param feedback_types: A feedback type or an iterable of them.
+        :param callback: Called with the event data dict; coroutine
+            functions are scheduled as tasks.
+        :param channel: Only receive channel-addressed events for this
+            channel; ``None`` receives every event of the device.
+        :return: A callable that removes the subscription.
+        """
+        if isinstance(feedback_types, str):
+            feedback_types = (feedback_types,)
+        entry = (callback, asyncio.iscoroutinefunction(callback))
+        keys = [(tuple(device_id), feedback_type) for feedback_type in feedback_types]
+        for key in keys:
+            self._subscriptions.setdefault(key, {}).setdefault(channel, []).append(entry)
+
+        def unsubscribe():
+            # drop the buckets left empty, a reload must not leave them behind
+            for key in keys:
+                channels = self._subscriptions.get(key)
+                bucket = channels.get(channel) if channels is not None else None
+                if bucket is None or entry not in bucket:
+                    continue
+                bucket.remove(entry)
+                if not bucket:
+                    del channels[channel]
+                    if not channels:
+                        del self._subscriptions[key]
+
+        return unsubscribe
+
+    def publish(self, hass: HomeAssistant, device_id, event_data: dict, channel=None):
+        """
+        Deliver ``event_data`` to the subscribers it concerns.
+
+        :param hass: The Home Assistant instance.
+        :param device_id: Device id the frame came from.
+        :param event_data: Event data; its ``feedback_type`` selects the
+            subscribers.
+        :param channel: Channel the frame is about, or ``None`` if it
+            carries the state of every channel.
+        """
+        if self.mirror_to_bus:
+            hass.bus.async_fire(str(device_id), event_data)
+
+        channels = self._subscriptions.get(
+            (tuple(device_id), event_data["feedback_type"])
+        )
+        if not channels:
+            return
+        if channel is None:
+            entries = [entry for bucket in channels.values() for entry in bucket]
+        else:
+            entries = [*channels.get(int(channel), ()), *channels.get(None, ())]
+
+        for callback, is_coroutine in entries:
+            try:
+                if is_coroutine:
+                    hass.async_create_task(callback(event_data))
+                else:
+                    callback(event_data)
+            except Exception as e:
+                logging.error(f"error in subscription callback for {device_id}: {e}")
@@ -16,10 +16,11 @@ from aiohttp import web
 import aiofiles
 import socket
 import logging
-from collections import defaultdict
+from functools import lru_cache, partial
 import json
 import psutil
 import asyncio
+import time
 
 # Optional Raspberry Pi display support
 try:
@@ -31,8 +32,83 @@ except ImportError:
     logging.debug("ST7789 display not available (not running on Raspberry Pi)")
 
 from TISControlProtocol.shared import get_real_mac
+from TISControlProtocol.ApplianceRegistry import Appliance, ApplianceRegistry
 
 protocol_handler = TISProtocolHandler()
+# upper bound for the scan rounds requested by the (unauthenticated) scan API
+MAX_SCAN_ROUNDS = 60
+
+
+class CaesarTable(dict):
+    """
+    str.translate table rotating letters by ``shift``.
+
+    ASCII letters come precomputed from str.maketrans. Other letters
+    (str.isalpha is true for them too) are rotated relative to "A"/"a"
+    like the original character loop did, and cached on first use, so
+    existing app.json files decode to the same text.
+    """
+
+    def __init__(self, shift: int):
+        upper = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        lower = upper.lower()
+        offset = shift % 26
+        super().__init__(
+            str.maketrans(
+                upper + lower,
+                upper[offset:] + upper[:offset] + lower[offset:] + lower[:offset],
+            )
+        )
+        self.shift = shift
+
+    def __missing__(self, code: int) -> int:
+        char = chr(code)
+        if char.isalpha():
+            base = ord("A") if char.isupper() else ord("a")
+            code_point = (code - base + self.shift) % 26 + base
+        else:
+            code_point = code
+        self[code] = code_point
+        return code_point
+
+
+@lru_cache(maxsize=None)
+def caesar_table(shift: int) -> CaesarTable:
+    return CaesarTable(shift)
+
+
+def translate_data(data, table: CaesarTable):
+    """Translate every string and dict key in nested dicts and lists."""
+
+    def convert(value):
+        if isinstance(value, str):
+            return value.translate(table), None
+        if isinstance(value, dict):
+            container = {}
+            return container, container
+        if isinstance(value, list):
+            container = []
+            return container, container
+        return value, None
+
+    result, container = convert(data)
+    # (source, copy) pairs still to fill, walked without recursion
+    stack = [(data, container)] if container is not None else []
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                converted, container = convert(value)
+                target[str(key).translate(table)] = converted
+                if container is not None:
+                    stack.append((value, container))
+        else:
+            for value in source:
+                converted, container = convert(value)
+                target.append(converted)
+                if container is not None:
+                    stack.append((value, container))
+    return result
 
 
 class TISApi:
@@ -55,6 +131,10 @@ class TISApi:
         self.transport = None
         self.hass = hass
         self.config_entries = {}
+        self.appliances = ApplianceRegistry()
+        # stat signature of the files config_entries was parsed from
+        self._config_signature = None
+        self._config_lock = asyncio.Lock()
         self.bill_configs = {}
         self.domain = domain
         self.devices_dict = devices_dict
@@ -88,19 +168,21 @@ class TISApi:
                 self.port,
                 self.hass,
             )
+            self.protocol.discovery.start()
         except Exception as e:
             logging.error("Error connecting to TIS API %s", e)
             raise ConnectionError
 
     async def _initialize_hass_data(self):
         """Initialize Home Assistant data."""
-        self.hass.data[self.domain]["discovered_devices"] = []
+        self.hass.data[self.domain]["discovered_devices"] = {}
 
     async def _register_http_views(self):
         """Register HTTP views."""
         try:
             self.hass.http.register_view(TISEndPoint(self))
             self.hass.http.register_view(ScanDevicesEndPoint(self))
+            self.hass.http.register_view(ScanDevicesStreamEndPoint(self))
             self.hass.http.register_view(GetKeyEndpoint(self))
             self.hass.http.register_view(ChangeSecurityPassEndpoint(self))
             self.hass.http.register_view(RestartEndpoint(self))
@@ -226,9 +308,15 @@ class TISApi:
             self.display.display(img)
 
     async def parse_device_manager_request(self, data: dict) -> None:
-        """Parse the device manager request."""
+        """
+        Parse the device manager request.
+
+        Appliances are loaded into the appliance registry; config_entries
+        keeps the remaining configuration (the lock module).
+        """
         if not data or "appliances" not in data:
             self.config_entries = {}
+            self.appliances.clear()
             return self.config_entries
         
         converted = {
@@ -254,32 +342,76 @@ class TISApi:
             for appliance, details in data["appliances"].items()
         }
 
-        grouped = defaultdict(list)
-        for appliance, details in converted.items():
-            grouped[details["appliance_type"]].append({appliance: details})
-        self.config_entries = dict(grouped)
+        self.appliances.load(converted)
 
         # add a lock module config entry
-        self.config_entries["lock_module"] = {
-            "password": data["configs"]["lock_module_password"]
+        self.config_entries = {
+            "lock_module": {"password": data["configs"]["lock_module_password"]}
         }
         return self.config_entries
 
-    async def get_entities(self, platform: str = None) -> list:
-        """Get the stored entities."""
+    @staticmethod
+    def _stat_signature(*paths: str) -> tuple:
+        """(mtime_ns, size) of every path, None for missing files."""
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    async def _load_config(self):
+        """
+        Read and parse the appliance files if they changed since last time.
+
+        The files are read and parsed once; later calls keep the parsed
+        configuration until the modification time or size of a file changes.
+        """
         directory = "/config/custom_components/tis_control/"
-        os.makedirs(directory, exist_ok=True)
+        async with self._config_lock:
+            signature = self._stat_signature(
+                "/config/tis_devices.json", os.path.join(directory, "app.json")
+            )
+            if signature != self._config_signature:
+                os.makedirs(directory, exist_ok=True)
+                data = await self.read_appliances(directory)
 
-        data = await self.read_appliances(directory)
-        
-        if not data:
-            logging.warning(f"⚠️ No appliance data found in {directory}app.json - integration may need initial configuration")
+                if not data:
+                    logging.warning(f"⚠️ No appliance data found in {directory}app.json - integration may need initial configuration")
+
+                await self.parse_device_manager_request(data)
+                self._config_signature = signature
+
+    async def get_appliances(self, platform: str) -> list[Appliance]:
+        """Get the appliance records of a platform."""
+        await self._load_config()
+        appliances = self.appliances.by_platform(platform)
+
+        if not appliances:
+            logging.info(f"ℹ️ No entities found for platform '{platform}'. Available platforms: {self.appliances.platforms}")
+
+        return appliances
+
+    async def get_entities(self, platform: str = None) -> list:
+        """
+        Get the stored entities.
+
+        Appliance platforms are returned in the configuration dict form,
+        ``[{name: details}, ...]``; other entries (``lock_module``) as stored.
+        """
+        await self._load_config()
+        if platform in self.config_entries:
+            entities = self.config_entries[platform]
+        else:
+            entities = [
+                {appliance.name: appliance.as_config()}
+                for appliance in self.appliances.by_platform(platform)
+            ]
 
-        await self.parse_device_manager_request(data)
-        entities = self.config_entries.get(platform, [])
-        
         if not entities:
-            logging.info(f"ℹ️ No entities found for platform '{platform}'. Available platforms: {list(self.config_entries.keys())}")
+            logging.info(f"ℹ️ No entities found for platform '{platform}'. Available platforms: {self.appliances.platforms}")
         
         return entities
 
@@ -309,8 +441,10 @@ class TISApi:
             async with aiofiles.open(output_file, "r") as f:
                 raw_data = await f.read()
                 if raw_data:
-                    encrypted_data = json.loads(raw_data)
-                    data = self.decrypt_data(encrypted_data)
+                    # parsing and decrypting a large file would block the loop
+                    data = await self.hass.async_add_executor_job(
+                        self._decode_appliances, raw_data
+                    )
                 else:
                     data = {}
         except FileNotFoundError:
@@ -410,12 +544,18 @@ class TISApi:
         file_name = "app.json"
         output_file = os.path.join(directory, file_name)
 
-        encrypted_data = self.encrypt_data(data)
+        encrypted_data = await self.hass.async_add_executor_job(self.encrypt_data, data)
         logging.warning(f"file (to be saved) length: {len(encrypted_data)}")
+        # parse the new file on the next get_entities
+        self._config_signature = None
 
         async with aiofiles.open(output_file, "w") as f:
             logging.warning("new appliances are getting saved in app.json")
-            await f.write(json.dumps(encrypted_data, indent=4))
+            await f.write(
+                await self.hass.async_add_executor_job(
+                    partial(json.dumps, encrypted_data, indent=4)
+                )
+            )
 
         logging.warning("new applinaces saved successfully")
 
@@ -438,43 +578,20 @@ class TISApi:
         return data
 
     def encrypt(self, text: str, shift: int = 5) -> str:
-        result = ""
-        for char in text:
-            if char.isalpha():
-                base = ord("A") if char.isupper() else ord("a")
-                result += chr((ord(char) - base + shift) % 26 + base)
-            else:
-                result += char
-        return result
+        return text.translate(caesar_table(shift))
 
     def decrypt(self, text: str, shift: int = 5) -> str:
         return self.encrypt(text, -shift)
 
     def encrypt_data(self, data, shift: int = 5):
-        if isinstance(data, dict):
-            return {
-                self.encrypt(str(k), shift): self.encrypt_data(v, shift)
-                for k, v in data.items()
-            }
-        elif isinstance(data, list):
-            return [self.encrypt_data(item, shift) for item in data]
-        elif isinstance(data, str):
-            return self.encrypt(data, shift)
-        else:
-            return data
+        return translate_data(data, caesar_table(shift))
 
     def decrypt_data(self, data, shift: int = 5):
-        if isinstance(data, dict):
-            return {
-                self.decrypt(str(k), shift): self.decrypt_data(v, shift)
-                for k, v in data.items()
-            }
-        elif isinstance(data, list):
-            return [self.decrypt_data(item, shift) for item in data]
-        elif isinstance(data, str):
-            return self.decrypt(data, shift)
-        else:
-            return data
+        return translate_data(data, caesar_table(-shift))
+
+    def _decode_appliances(self, raw_data: str) -> dict:
+        """Parse and decrypt the content of app.json."""
+        return self.decrypt_data(json.loads(raw_data))
 
 
 class TISEndPoint(HomeAssistantView):
@@ -520,30 +637,156 @@ class ScanDevicesEndPoint(HomeAssistantView):
         self.discovery_packet: TISPacket = protocol_handler.generate_discovery_packet()
 
     async def get(self, request):
-        # Discover network devices
-        devices = await self.discover_network_devices()
-        devices = [
-            {
-                "device_id": device["device_id"],
-                "device_type_code": device["device_type"],
-                "device_type_name": self.api.devices_dict.get(
-                    tuple(device["device_type"]), tuple(device["device_type"])
-                ),
-                "gateway": device["source_ip"],
+        # Answer from the discovery cache, ?refresh=1 runs an active scan first
+        discovery = self.api.protocol.discovery
+        if request.query.get("refresh") not in ("1", "true"):
+            devices = discovery.get_devices()
+        else:
+            try:
+                options = self.scan_options(request)
+            except ValueError as e:
+                return web.json_response(
+                    {"error": f"invalid scan option: {e}"}, status=400
+                )
+            scanned = await self.discover_network_devices(**options)
+            devices = discovery.get_devices(device.device_key for device in scanned)
+        return web.json_response([self.describe_device(device) for device in devices])
+
+    @staticmethod
+    def scan_options(request) -> dict:
+        """Read max_rounds, quiet_rounds and interval from the query string."""
+        max_rounds = int(request.query.get("max_rounds", 30))
+        quiet_rounds = int(request.query.get("quiet_rounds", 3))
+        return {
+            "max_rounds": min(MAX_SCAN_ROUNDS, max(1, max_rounds)),
+            "quiet_rounds": min(MAX_SCAN_ROUNDS, max(1, quiet_rounds)),
+            "interval": min(5.0, max(0.1, float(request.query.get("interval", 1)))),
+        }
+
+    def describe_device(self, device) -> dict:
+        """Convert a discovery frame to the record returned to the UI."""
+        return {
+            "device_id": device["device_id"],
+            "device_type_code": device["device_type"],
+            "device_type_name": self.api.devices_dict.get(
+                tuple(device["device_type"]), tuple(device["device_type"])
+            ),
+            "gateway": device["source_ip"],
+            "last_seen": device.get("last_seen"),
+        }
+
+    async def discover_network_devices(
+        self, max_rounds=30, quiet_rounds=3, interval=1.0, on_device=None
+    ) -> list:
+        """
+        Broadcast discovery rounds until the network has gone quiet.
+
+        :param max_rounds: Upper bound on the number of broadcasts.
+        :param quiet_rounds: Stop after this many rounds found no new device.
+        :param interval: Seconds to listen for answers after each broadcast.
+        :param on_device: Called with the discovery frame of every new
+            device as soon as it arrives.
+        :return: The discovery frames, one per device.
+        """
+        # devices answering this scan, keyed by device id; concurrent scans
+        # each keep their own
+        discovered = {}
+        observers = self.api.protocol.receiver.dispatcher.observers
+
+        def observe(info):
+            if info.opcode == (0x00, 0x0F) and info.device_key not in discovered:
+                discovered[info.device_key] = info
+                if on_device is not None:
+                    on_device(info)
+
+        observers.append(observe)
+        started = time.monotonic()
+        quiet = 0
+        try:
+            for i in range(max_rounds):
+                known = len(discovered)
+                await self.api.protocol.sender.broadcast_packet(self.discovery_packet)
+                await asyncio.sleep(interval)
+                quiet = quiet + 1 if len(discovered) == known else 0
+                if quiet >= quiet_rounds:
+                    break
+        finally:
+            observers.remove(observe)
+
+        logging.info(
+            f"discovery found {len(discovered)} devices in {i + 1} rounds, "
+            f"{time.monotonic() - started:.1f}s"
+        )
+        return list(discovered.values())
+
+
+class ScanDevicesStreamEndPoint(ScanDevicesEndPoint):
+    """
+    Scan Devices API endpoint streaming results as Server-Sent Events.
+
+    Every device is sent once, as a ``device`` event as soon as its first
+    discovery response of this scan arrives; a final ``summary`` event carries the
+    device count and the scan duration. If the scan fails, an ``error``
+    event ends the stream instead.
+    """
+
+    url = "/api/scan_devices/stream"
+    name = "api:scan_devices_stream"
+
+    async def get(self, request):
+        try:
+            options = self.scan_options(request)
+        except ValueError as e:
+            return web.json_response({"error": f"invalid scan option: {e}"}, status=400)
+
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
             }
-            for device in devices
-        ]
-        return web.json_response(devices)
-
-    async def discover_network_devices(self, broadcast_attempts=30) -> list:
-        # empty current discovered devices list
-        self.api.hass.data[self.api.domain]["discovered_devices"] = []
-        for i in range(broadcast_attempts):
-            await self.api.protocol.sender.broadcast_packet(self.discovery_packet)
-            # sleep for 1 sec
-            await asyncio.sleep(1)
-
-        return self.api.hass.data[self.api.domain]["discovered_devices"]
+        )
+        await response.prepare(request)
+
+        discovery = self.api.protocol.discovery
+        found = asyncio.Queue()
+        started = time.monotonic()
+        scan = asyncio.create_task(
+            self.discover_network_devices(on_device=found.put_nowait, **options)
+        )
+        scan.add_done_callback(lambda _: found.put_nowait(None))
+        streamed = set()  # device ids already sent on this stream
+        try:
+            while (device := await found.get()) is not None:
+                if device.device_key in streamed:
+                    continue
+                streamed.add(device.device_key)
+                # the cache has seen the frame first and holds its last_seen
+                device = discovery.devices.get(device.device_key, device)
+                await self.send_event(response, "device", self.describe_device(device))
+            try:
+                devices = scan.result()
+            except Exception as e:
+                logging.error(f"error scanning devices: {e}")
+                await self.send_event(response, "error", {"error": str(e)})
+                return response
+            await self.send_event(
+                response,
+                "summary",
+                {
+                    "count": len(devices),
+                    "duration": round(time.monotonic() - started, 2),
+                },
+            )
+        except ConnectionResetError:
+            logging.info("scan stream closed by the client")
+        finally:
+            scan.cancel()
+        return response
+
+    @staticmethod
+    async def send_event(response: web.StreamResponse, event: str, data: dict):
+        await response.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
 
 
 class GetKeyEndpoint(HomeAssistantView):
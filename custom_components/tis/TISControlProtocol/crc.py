@@ -1,4 +1,5 @@
-from ctypes import *
+import builtins
+from itertools import islice
 
 # -------------------------------------- #
 CRC_TAB = [
@@ -261,36 +262,87 @@ CRC_TAB = [
 ]
 
 
+# -------------------------------------- #
+# The CRC covers everything after the IP address, the "SMARTCLOUD" header
+# and the 0xAAAA lead code, i.e. the frame from the length byte onwards.
+CRC_OFFSET = 16
+BYTES_TYPES = (builtins.bytes, bytearray, memoryview)
+
+
 # -------------------------------------- #
 def bytes(intParam):
     return divmod(intParam, 0x100)
 
 
+# -------------------------------------- #
+def crc16(data, crc: int = 0) -> int:
+    """Run the table-driven CRC over ``data``, continuing from ``crc``.
+
+    ``data`` may be any iterable of ints (bytes, bytearray, memoryview, list).
+    """
+    table = CRC_TAB
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+# -------------------------------------- #
+class CRCState:
+    """CRC state over a fixed prefix that can be resumed for any suffix.
+
+    Frames for the same device, opcode and payload length share every CRC
+    byte up to the payload, so the state is computed once and each frame
+    only runs the table over its payload.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, data=(), value: int = 0):
+        self.value = crc16(data, value)
+
+    def update(self, data) -> "CRCState":
+        self.value = crc16(data, self.value)
+        return self
+
+    def resume(self, data) -> int:
+        """Return the checksum of prefix + ``data`` without changing the state."""
+        return crc16(data, self.value)
+
+
+# -------------------------------------- #
+def _span(frame, start: int, end: int):
+    if isinstance(frame, BYTES_TYPES):
+        return memoryview(frame)[start:end]
+    return islice(frame, start, end)
+
+
+# -------------------------------------- #
+def compute(frame, start: int = CRC_OFFSET) -> int:
+    """Return the checksum of an unsigned frame without touching it."""
+    return crc16(_span(frame, start, len(frame)))
+
+
+# -------------------------------------- #
+def verify(frame, start: int = CRC_OFFSET) -> bool:
+    """Check the two trailing CRC bytes of ``frame`` in place."""
+    length = len(frame)
+    if length < start + 2:
+        return False
+    crc = crc16(_span(frame, start, length - 2))
+    return frame[length - 2] == crc >> 8 and frame[length - 1] == crc & 0xFF
+
+
 # -------------------------------------- #
 def packCRC(ptr):
-    crc = c_ushort(0)
-    for i in range(len(ptr) - 16):
-        data = c_ubyte(crc.value >> 8)
-        crc.value <<= 8
-        reg = c_ubyte(data.value ^ ptr[i + 16])
-        crc = c_ushort(crc.value ^ CRC_TAB[reg.value])
-    crcValueH, crcValueL = bytes(crc.value)
-    ptr.append(crcValueH)
-    ptr.append(crcValueL)
+    crc = compute(ptr)
+    ptr.append(crc >> 8)
+    ptr.append(crc & 0xFF)
     return ptr
 
 
 # -------------------------------------- #
 def checkCRC(ptr):
-    crcValueL = ptr.pop()
-    crcValueH = ptr.pop()
-    targPtr = packCRC(ptr)
-    if (targPtr[len(targPtr) - 1] == crcValueL) and (
-        targPtr[len(targPtr) - 2] == crcValueH
-    ):
-        return True
-    else:
-        return False
+    return verify(ptr)
 
 
 # -------------------------------------- #
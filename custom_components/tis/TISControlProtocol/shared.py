@@ -1,18 +1,75 @@
 import logging
 import aiofiles
 import os
+from TISControlProtocol.ApplianceRegistry import Appliance, ApplianceRegistry
+from TISControlProtocol.SubscriptionRegistry import SubscriptionRegistry
+
 
 appliances_dict = {}
 mqtt_appliances_dict = {}
 ack_events = {}
 loggers = {}
+subscriptions = SubscriptionRegistry()
+# debug: also put the raw frame payload in event data as "additional_bytes"
+raw_event_bytes = False
+
+
+def with_raw_bytes(event_data: dict, info) -> dict:
+    """
+    Add the raw payload of ``info`` to ``event_data`` if ``raw_event_bytes`` is set.
+
+    Event data only carries decoded values; the payload list is built, and
+    kept alive by bus listeners and the recorder, only when debugging.
+    """
+    if raw_event_bytes:
+        event_data["additional_bytes"] = info["additional_bytes"]
+    return event_data
+
+
+def resolve_ack(unique_id: tuple, value: int | None = None) -> bool:
+    """
+    Resolve the commands waiting for the ack identified by ``unique_id``.
+
+    A command that expects a value in its ack (e.g. a channel level) is
+    only resolved by an ack carrying that value; a late or duplicate ack
+    for an earlier value leaves it waiting.
+
+    :param unique_id: ``(device_id, operation_code, channel)`` of the command.
+    :param value: Value reported by the ack, if it carries one.
+    :return: True if a command was resolved.
+    """
+    futures = ack_events.get(unique_id)
+    if not futures:
+        return False
+    resolved = False
+    for future, expected in list(futures.items()):
+        if expected is not None and value is not None and value != expected:
+            continue
+        del futures[future]
+        if not future.done():
+            future.set_result(True)
+        resolved = True
+    if not futures:
+        del ack_events[unique_id]
+    return resolved
+
+def get_appliance(device_id: tuple, channel, appliances) -> Appliance | None:
+    """
+    Appliance owning ``channel`` of ``device_id``.
 
-def get_appliance(device_id: tuple, channel: tuple, appliances_dict: dict):
-    # appliance key form is ((device_id),(channels))
+    :param appliances: The ApplianceRegistry (``TISApi.appliances``), looked
+        up through its (device, channel) index; a plain dict keyed by
+        ``((device_id), (channels))`` is scanned.
+    """
+    if isinstance(appliances, ApplianceRegistry):
+        appliance = appliances.get(device_id, channel)
+        if appliance is None:
+            logging.error(f"No appliances found for key {(device_id,channel)}")
+        return appliance
     try:
         device_appliances = [
             a
-            for k, a in appliances_dict.items()
+            for k, a in appliances.items()
             if k[0] == device_id and channel in k[1]
         ]
         return tuple(device_appliances)[0]
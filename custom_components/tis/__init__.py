@@ -23,6 +23,7 @@ for p in _to_remove:
 _COMPONENT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, _COMPONENT_DIR)
 
+from TISControlProtocol import shared
 from TISControlProtocol.api import TISApi
 from TISControlProtocol.Protocols.udp.ProtocolHandler import TISProtocolHandler
 
@@ -102,6 +103,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: TISConfigEntry) -> bool:
         logging.warning(f"couldn't read the version error: {e}")
         version = "0.0.0"
     
+    # Raw frame payloads in event data only when debug logging is enabled
+    shared.raw_event_bytes = logging.getLogger(__name__).isEnabledFor(logging.DEBUG)
+
     # Create TISApi instance
     tis_api = TISApi(
         port=int(entry.data["port"]),
@@ -121,7 +125,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: TISConfigEntry) -> bool:
     except ConnectionError as e:
         logging.error("error connecting to TIS api %s", e)
         return False
-    
+
+    # Stop the discovery broadcasts on unload, a reload starts a new timer
+    entry.async_on_unload(tis_api.protocol.discovery.stop)
+
     # Setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
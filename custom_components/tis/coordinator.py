@@ -3,10 +3,11 @@ from datetime import timedelta
 import logging
 from TISControlProtocol.api import TISApi
 from TISControlProtocol.Protocols.udp.ProtocolHandler import TISPacket,TISProtocolHandler
+from TISControlProtocol.Protocols.udp.OutboundQueue import PRIORITY_TELEMETRY
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 _LOGGER=logging.getLogger(__name__)
 HANDLER=TISProtocolHandler()
 class SensorUpdateCoordinator(DataUpdateCoordinator):
     def __init__(A,hass,api,update_interval,device_id,update_packet):B=device_id;A.api=api;A.device_id=B;A.update_packet=update_packet;super().__init__(hass,_LOGGER,name=f"Sensor Update Coordinator for {B}",update_interval=update_interval)
-    async def _async_update_data(A):return await A.api.protocol.sender.send_packet(A.update_packet)
\ No newline at end of file
+    async def _async_update_data(A):return await A.api.protocol.sender.send_packet(A.update_packet,PRIORITY_TELEMETRY)
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""Diagnostics support for TIS."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import TISConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: TISConfigEntry
+) -> dict[str, Any]:
+    """Return the protocol counters and latencies of a config entry."""
+    api = entry.runtime_data.api
+    if api.protocol is None:
+        return {"connected": False}
+    return {"connected": True, **api.protocol.diagnostics()}
@@ -1,11 +1,10 @@
 from __future__ import annotations
-_D='device_id'
 _C='vacation'
 _B='disarm'
 _A=None
 from homeassistant.components.select import SelectEntity
 from TISControlProtocol.api import TISApi
-from homeassistant.const import MATCH_ALL,STATE_UNAVAILABLE
+from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import callback,Event,HomeAssistant
 from TISControlProtocol.Protocols.udp.ProtocolHandler import TISPacket,TISProtocolHandler
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -15,26 +14,27 @@ SECURITY_OPTIONS={_C:1,'away':2,'night':3,_B:6}
 SECURITY_FEEDBACK_OPTIONS={1:_C,2:'away',3:'night',6:_B}
 handler=TISProtocolHandler()
 async def async_setup_entry(hass,entry,async_add_devices):
-    A=entry.runtime_data.api;B=await A.get_entities(platform='security')
-    if B:C=[(C,next(iter(A['channels'][0].values())),A[_D],A['gateway'])for B in B for(C,A)in B.items()];D=[TISSecurity(api=A,name=B,options=list(SECURITY_OPTIONS.keys()),initial_option=_B,channel_number=C,device_id=D,gateway=E)for(B,C,D,E)in C];async_add_devices(D)
+    A=entry.runtime_data.api;B=await A.get_appliances(platform='security')
+    if B:D=[TISSecurity(api=A,name=B.name,options=list(SECURITY_OPTIONS.keys()),initial_option=_B,channel_number=B.channels[0].number,device_id=B.device_id,gateway=B.gateway)for B in B];async_add_devices(D)
 protocol_handler=TISProtocolHandler()
 class TISSecurity(SelectEntity):
-    def __init__(A,api,name,options,initial_option,channel_number,device_id,gateway):A._name=name;A.api=api;A.unique_id=f"select_{A}";A._attr_options=options;A._attr_current_option=A._state=initial_option;A._attr_icon='mdi:shield';A._attr_is_protected=True;A._attr_read_only=True;A._listener=_A;A.channel_number=int(channel_number);A.device_id=device_id;A.gateway=gateway;A.update_packet=protocol_handler.generate_update_security_packet(A)
+    def __init__(A,api,name,options,initial_option,channel_number,device_id,gateway):A._name=name;A.api=api;A.unique_id=f"select_{A}";A._attr_options=options;A._attr_current_option=A._state=initial_option;A._attr_icon='mdi:shield';A._attr_is_protected=True;A._attr_read_only=True;A._listener=_A;A._admin_listener=_A;A.channel_number=int(channel_number);A.device_id=device_id;A.gateway=gateway;A.update_packet=protocol_handler.generate_update_security_packet(A)
     async def async_added_to_hass(A):
         @callback
-        async def B(event):
-            E='feedback_type';B=event
-            if B.event_type=='admin_lock':
-                logging.info(f"admin lock event: {B}")
-                if B.data.get('locked'):A.protect()
-                else:A.unprotect()
-            if B.data.get(E)=='security_feedback'or B.data.get(E)=='security_update':
-                logging.info(f"security feedback event: {B}")
-                if A.channel_number==B.data['channel_number']and A.device_id==B.data[_D]:
-                    C=B.data['mode']
-                    if C in SECURITY_FEEDBACK_OPTIONS:D=SECURITY_FEEDBACK_OPTIONS[C];logging.info(f"mode: {C}, option: {D}");A._state=A._attr_current_option=D
+        def B(event):
+            B=event;logging.info(f"admin lock event: {B}")
+            if B.data.get('locked'):A.protect()
+            else:A.unprotect()
             A.async_write_ha_state()
-        A._listener=A.hass.bus.async_listen(MATCH_ALL,B);await A.api.protocol.sender.send_packet(A.update_packet);logging.info(f"update packet sent: {A}");logging.info(f"listener added: {A}")
+        @callback
+        def C(data):
+            B=data;logging.info(f"security feedback event: {B}");C=B['mode']
+            if C in SECURITY_FEEDBACK_OPTIONS:D=SECURITY_FEEDBACK_OPTIONS[C];logging.info(f"mode: {C}, option: {D}");A._state=A._attr_current_option=D
+            A.async_write_ha_state()
+        A._admin_listener=A.hass.bus.async_listen('admin_lock',B);A._listener=A.api.protocol.subscriptions.subscribe(A.device_id,('security_feedback','security_update'),C,A.channel_number);A.api.protocol.warmup.request(A.update_packet);logging.info(f"update packet queued: {A}");logging.info(f"listener added: {A}")
+    async def async_will_remove_from_hass(A):
+        if A._listener:A._listener();A._listener=_A
+        if A._admin_listener:A._admin_listener();A._admin_listener=_A
     @property
     def name(self):return self._name
     @property
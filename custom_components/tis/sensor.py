@@ -25,6 +25,7 @@ except ImportError:
 
 from TISControlProtocol.api import TISApi
 from TISControlProtocol.Protocols.udp.ProtocolHandler import TISProtocolHandler
+from TISControlProtocol.Protocols.udp.PacketHandlers.EnergyFeedbackHandler import track_energy_field
 from homeassistant.components.sensor import SensorEntity,UnitOfTemperature
 from homeassistant.core import Event,HomeAssistant,callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -39,9 +40,9 @@ class TISSensorEntity:
 async def async_setup_entry(hass,entry,async_add_devices):
     B=hass;A=entry.runtime_data.api;await A.get_bill_configs();J=[]
     for(I,D)in RELEVANT_TYPES.items():
-        K=await A.get_entities(platform=I)
+        K=await A.get_appliances(platform=I)
         if K and len(K)>0:
-            N=[(C,next(iter(A['channels'][0].values())),A['device_id'],A['is_protected'],A['gateway'],A['min'],A['max'],A['settings'])for B in K for(C,A)in B.items()];C=[]
+            N=[(C.name,C.channels[0].number,C.device_id,C.is_protected,C.gateway,C.min,C.max,C.settings)for C in K];C=[]
             for(E,F,G,Q,H,min,max,O)in N:
                 if I==_E:C.append(D(hass=B,tis_api=A,gateway=H,name=E,device_id=G,channel_number=F,min=min,max=max,settings=O))
                 elif I==_C:
@@ -76,35 +77,35 @@ protocol_handler=TISProtocolHandler()
 _LOGGER=logging.getLogger(__name__)
 coordinators={}
 class CoordinatedTemperatureSensor(BaseSensorEntity,SensorEntity):
-    def __init__(A,hass,tis_api,gateway,name,device_id,channel_number):C=channel_number;B=device_id;D=get_coordinator(hass,tis_api,B,gateway,_I,C);super().__init__(D,name,B);A._attr_icon=_J;A.name=name;A.device_id=B;A.channel_number=C;A._attr_unique_id=f"sensor_{A}"
+    def __init__(A,hass,tis_api,gateway,name,device_id,channel_number):C=channel_number;B=device_id;D=get_coordinator(hass,tis_api,B,gateway,_I,C);super().__init__(D,name,B);A._attr_icon=_J;A.api=tis_api;A.name=name;A.device_id=B;A.channel_number=C;A._attr_unique_id=f"sensor_{A}"
     async def async_added_to_hass(A):
         await super().async_added_to_hass()
         @callback
-        def B(event):
-            B=event
+        def B(data):
+            B=data
             try:
-                if B.data[_B]=='temp_feedback':A._state=B.data['temp']
+                if B[_B]=='temp_feedback':A._state=B['temp']
                 A.async_write_ha_state()
             except Exception as C:logging.error(f"event data error for temperature: {B}")
-        A.hass.bus.async_listen(str(A.device_id),B)
+        A.async_on_remove(A.api.protocol.subscriptions.subscribe(A.device_id,'temp_feedback',B))
     def _update_state(A,data):0
     @property
     def unit_of_measurement(self):return UnitOfTemperature.CELSIUS
 class CoordinatedLUXSensor(BaseSensorEntity,SensorEntity):
-    def __init__(A,hass,tis_api,gateway,name,device_id,channel_number):C=channel_number;B=device_id;D=get_coordinator(hass,tis_api,B,gateway,_D,C);super().__init__(D,name,B);A._attr_icon='mdi:brightness-6';A.name=name;A.device_id=B;A.channel_number=C;A._attr_unique_id=f"sensor_{A}"
+    def __init__(A,hass,tis_api,gateway,name,device_id,channel_number):C=channel_number;B=device_id;D=get_coordinator(hass,tis_api,B,gateway,_D,C);super().__init__(D,name,B);A._attr_icon='mdi:brightness-6';A.api=tis_api;A.name=name;A.device_id=B;A.channel_number=C;A._attr_unique_id=f"sensor_{A}"
     async def async_added_to_hass(A):
         await super().async_added_to_hass()
         @callback
-        def B(event):
-            B=event
+        def B(data):
+            B=data
             try:
-                if B.data[_B]==_K:A._state=int(B.data['lux'])
+                if B[_B]==_K:A._state=int(B['lux'])
                 A.async_write_ha_state()
             except Exception as C:logging.error(f"event data error for lux: {B}")
-        A.hass.bus.async_listen(str(A.device_id),B)
+        A.async_on_remove(A.api.protocol.subscriptions.subscribe(A.device_id,_K,B))
     def _update_state(A,data):0
 class CoordinatedHealthSensor(BaseSensorEntity,SensorEntity):
-    def __init__(A,hass,tis_api,gateway,name,device_id,channel_number,key=_A,sensor_type='sensor'):C=channel_number;B=device_id;D=get_coordinator(hass,tis_api,B,gateway,_D,C);super().__init__(D,name,B);A._attr_icon='mdi:heart-pulse';A.name=name;A.device_id=B;A.channel_number=C;A._attr_unique_id=f"sensor_{A}";A._key=key;A._sensor_type=sensor_type;A.states=HEALTH_STATES
+    def __init__(A,hass,tis_api,gateway,name,device_id,channel_number,key=_A,sensor_type='sensor'):C=channel_number;B=device_id;D=get_coordinator(hass,tis_api,B,gateway,_D,C);super().__init__(D,name,B);A._attr_icon='mdi:heart-pulse';A.api=tis_api;A.name=name;A.device_id=B;A.channel_number=C;A._attr_unique_id=f"sensor_{A}";A._key=key;A._sensor_type=sensor_type;A.states=HEALTH_STATES
     def calculate_health_percentage(O,health):
         B=health;A=B['temp']
         if A is _A:C=0
@@ -138,34 +139,34 @@ class CoordinatedHealthSensor(BaseSensorEntity,SensorEntity):
     async def async_added_to_hass(A):
         await super().async_added_to_hass()
         @callback
-        def B(event):
-            B=event
+        def B(data):
+            B=data
             try:
-                if B.data[_B]==_K:
+                if B[_B]==_K:
                     logging.info(f"Health feedback received: {B}")
-                    if A._sensor_type==_H:A._state=A.calculate_health_percentage(B.data)
+                    if A._sensor_type==_H:A._state=A.calculate_health_percentage(B)
                     else:
-                        A._state=int(B.data.get(A._key,_A))
+                        A._state=int(B.get(A._key,_A))
                         if A._key.find('state')!=-1:A._state=A.states.get(str(A._state),_A)
                 A.async_write_ha_state()
             except Exception as C:logging.error(f"event data error for health: {B}")
-        A.hass.bus.async_listen(str(A.device_id),B)
+        A.async_on_remove(A.api.protocol.subscriptions.subscribe(A.device_id,_K,B))
     def _update_state(A,data):0
 class CoordinatedAnalogSensor(BaseSensorEntity,SensorEntity):
     def __init__(A,hass,tis_api,gateway,name,device_id,channel_number,min=0,max=100,settings=_A):
-        D=channel_number;C=device_id;B=settings;E=get_coordinator(hass,tis_api,C,gateway,_E,D);super().__init__(E,name,C);A._attr_icon=_L;A.name=name;A.device_id=C;A.channel_number=D;A.min=min;A.max=max;A._attr_unique_id=f"sensor_{A}"
+        D=channel_number;C=device_id;B=settings;E=get_coordinator(hass,tis_api,C,gateway,_E,D);super().__init__(E,name,C);A._attr_icon=_L;A.api=tis_api;A.name=name;A.device_id=C;A.channel_number=D;A.min=min;A.max=max;A._attr_unique_id=f"sensor_{A}"
         if B:B=json.loads(B);A.min_capacity=int(B.get('min_capacity',0));A.max_capacity=int(B.get('max_capacity',100))
         else:raise ValueError('min and max capacity values are required for analog sensors')
     async def async_added_to_hass(A):
         await super().async_added_to_hass()
         @callback
-        def B(event):
-            B=event
+        def B(data):
+            B=data
             try:
-                if B.data[_B]=='analog_feedback':D=float(B.data['analog'][A.channel_number-1]);C=(D-A.min)/(A.max-A.min);C=max(0,min(1,C));A._state=A.min_capacity+(A.max_capacity-A.min_capacity)*C
+                if B[_B]=='analog_feedback':D=float(B['analog'][A.channel_number-1]);C=(D-A.min)/(A.max-A.min);C=max(0,min(1,C));A._state=A.min_capacity+(A.max_capacity-A.min_capacity)*C
                 A.async_write_ha_state()
             except Exception as E:logging.error(f"event data error for analog sensor: {B} \n error: {E}")
-        A.hass.bus.async_listen(str(A.device_id),B)
+        A.async_on_remove(A.api.protocol.subscriptions.subscribe(A.device_id,'analog_feedback',B))
     def _update_state(A,data):0
 class CPUTemperatureSensor(SensorEntity):
     def __init__(A,hass):
@@ -186,23 +187,24 @@ class CoordinatedEnergySensor(BaseSensorEntity,SensorEntity):
     async def async_added_to_hass(A):
         await super().async_added_to_hass()
         @callback
-        def B(event):
-            I='price_per_kw';H='monthly_energy_feedback';F='energy';E='channel_num';B=event
+        def B(data):
+            I='price_per_kw';H='monthly_energy_feedback';F='energy';E='channel_num';B=data
             try:
-                if B.data[_B]=='energy_feedback'and A.sensor_type==_C:
-                    if B.data[E]==A.channel_number:A._state=float(B.data[F].get(A._key,_A))
-                elif B.data[_B]==H and A.sensor_type==_F:
-                    if B.data[E]==A.channel_number:A._state=B.data[F]
-                elif B.data[_B]==H and A.sensor_type==_G:
-                    if B.data[E]==A.channel_number:
-                        J=datetime.now().month;K=J in[6,7,8,9];C=A.api.bill_configs.get('summer_rates',{})if K else A.api.bill_configs.get('winter_rates',{});G=B.data[F];D=_A
+                if B[_B]=='energy_feedback'and A.sensor_type==_C:
+                    if B[E]==A.channel_number:A._state=float(B[F].get(A._key,_A))
+                elif B[_B]==H and A.sensor_type==_F:
+                    if B[E]==A.channel_number:A._state=B[F]
+                elif B[_B]==H and A.sensor_type==_G:
+                    if B[E]==A.channel_number:
+                        J=datetime.now().month;K=J in[6,7,8,9];C=A.api.bill_configs.get('summer_rates',{})if K else A.api.bill_configs.get('winter_rates',{});G=B[F];D=_A
                         for(L,M)in enumerate(C):
                             if G<M['min_kw']:D=C[L-1][I];break
                         if D is _A and len(C)>0:D=C[-1][I]
                         A._state=int(D*G)
                 A.async_write_ha_state()
             except Exception as N:logging.error(f"error in self.name: {A}, self._key: {A}, self.sensor_type: {A}");logging.error(f"event data error for energy sensor: {B} \n error: {N}")
-        A.hass.bus.async_listen(str(A.device_id),B)
+        A.async_on_remove(A.api.protocol.subscriptions.subscribe(A.device_id,('energy_feedback','monthly_energy_feedback'),B))
+        if A.sensor_type==_C and A._key:A.async_on_remove(track_energy_field(A.device_id,A.channel_number,A._key))
     def _update_state(A,data):0
     @property
     def native_value(self):return self.state
@@ -1,53 +1,42 @@
 from __future__ import annotations
 _A=None
 from collections.abc import Callable
-from datetime import timedelta
-from math import ceil
 from typing import Any
-from TISControlProtocol.BytesHelper import int_to_8_bit_binary
 from TISControlProtocol.api import TISApi
 from TISControlProtocol.Protocols.udp.ProtocolHandler import TISPacket,TISProtocolHandler
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.const import MATCH_ALL,STATE_OFF,STATE_ON,STATE_UNKNOWN,Platform
+from homeassistant.const import STATE_OFF,STATE_ON,STATE_UNKNOWN,Platform
 from homeassistant.core import Event,HomeAssistant,callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
 import logging
 from.import TISConfigEntry
-POLLING_INTERVAL=timedelta(seconds=60)
 async def async_setup_entry(hass,entry,async_add_devices):
-    A=entry.runtime_data.api;B=await A.get_entities(platform=Platform.SWITCH)
+    A=entry.runtime_data.api;B=await A.get_appliances(platform=Platform.SWITCH)
     if B:
-        C=[(C,next(iter(A['channels'][0].values())),A['device_id'],A['is_protected'],A['gateway'])for B in B for(C,A)in B.items()]
-        try:D=[TISSwitch(A,B,C,D,E)for(B,C,D,F,E)in C];async_add_devices(D,update_before_add=True)
+        try:D=[TISSwitch(A,B.name,B.channels[0].number,B.device_id,B.gateway)for B in B];async_add_devices(D,update_before_add=True)
         except Exception as E:logging.error(f"error happened creating entities e: {E}")
 protocol_handler=TISProtocolHandler()
 class TISSwitch(SwitchEntity):
-    def __init__(A,tis_api,switch_name,channel_number,device_id,gateway):B=switch_name;A.api=tis_api;A._name=B;A.device_id=device_id;A.channel_number=int(channel_number);A._attr_unique_id=f"switch_{device_id}_{channel_number}";A._state=STATE_UNKNOWN;A._attr_is_on=_A;A.name=B;A.gateway=gateway;A.listener=_A;A.broadcast_channel=255;A.on_packet=protocol_handler.generate_control_on_packet(A);A.off_packet=protocol_handler.generate_control_off_packet(A);A.update_packet=protocol_handler.generate_control_update_packet(A);A._update_task_unsub=_A
+    def __init__(A,tis_api,switch_name,channel_number,device_id,gateway):B=switch_name;A.api=tis_api;A._name=B;A.device_id=device_id;A.channel_number=int(channel_number);A._attr_unique_id=f"switch_{device_id}_{channel_number}";A._state=STATE_UNKNOWN;A._attr_is_on=_A;A.name=B;A.gateway=gateway;A.listener=_A;A.broadcast_channel=255;A.on_packet=protocol_handler.generate_control_on_packet(A);A.off_packet=protocol_handler.generate_control_off_packet(A);A.update_packet=protocol_handler.generate_control_update_packet(A)
     def _start_polling(A):
-        if not A._update_task_unsub:logging.info(f"Starting state polling for {A}");A._update_task_unsub=async_track_time_interval(A.hass,A._async_poll_for_state,POLLING_INTERVAL)
+        if A.api.protocol.update_coordinator.start_polling(A,A.update_packet):logging.info(f"Starting state polling for {A}")
     def _stop_polling(A):
-        if A._update_task_unsub:logging.info(f"Stopping state polling for {A}");A._update_task_unsub();A._update_task_unsub=_A
-    async def _async_poll_for_state(A,now=_A):logging.info(f"Polling for state of {A}");await A.api.protocol.sender.send_packet(A.update_packet)
+        if A.api.protocol.update_coordinator.stop_polling(A,A.update_packet):logging.info(f"Stopping state polling for {A}")
     async def async_added_to_hass(A):
         @callback
-        async def B(event):
-            F='channel_number';E='additional_bytes';D='feedback_type';B=event;C=A._state
-            if B.event_type==str(A.device_id):
-                if B.data[D]=='control_response':
-                    G=B.data[E][2];H=B.data[F]
-                    if int(H)==A.channel_number:C=STATE_ON if int(G)==100 else STATE_OFF
-                elif A.channel_number!=A.broadcast_channel:
-                    if B.data[D]=='binary_feedback':I=ceil(B.data[E][0]/8);J=alpha__("").join(int_to_8_bit_binary(B.data[E][A])for A in range(1,I+1));C=STATE_ON if J[A.channel_number-1]=='1'else STATE_OFF
-                    elif B.data[D]=='update_response':K=B.data[E];L=int(K[A.channel_number]);C=STATE_ON if L>0 else STATE_OFF
-                elif B.data[D]=='offline_device':
-                    if int(B.data[F])==A.channel_number:C=STATE_UNKNOWN
-                if A._state!=C:
-                    A._state=C
-                    if A._state in(STATE_ON,STATE_OFF):A._stop_polling()
-                    A.async_write_ha_state()
-                elif A._state==STATE_UNKNOWN:A._start_polling()
-        try:A.listener=A.hass.bus.async_listen(MATCH_ALL,B);await A._async_poll_for_state();A._start_polling()
+        def B(data):
+            D='feedback_type';B=data;C=A._state
+            if B[D]=='control_response':G=B['value'];C=STATE_ON if int(G)==100 else STATE_OFF
+            elif A.channel_number!=A.broadcast_channel:
+                if B[D]=='binary_feedback':C=STATE_ON if B['states']>>A.channel_number-1&1 else STATE_OFF
+                elif B[D]=='update_response':K=B['values'];L=int(K[A.channel_number-1]);C=STATE_ON if L>0 else STATE_OFF
+            elif B[D]=='offline_device':C=STATE_UNKNOWN
+            if A._state!=C:
+                A._state=C
+                if A._state in(STATE_ON,STATE_OFF):A._stop_polling()
+                A.async_write_ha_state()
+            elif A._state==STATE_UNKNOWN:A._start_polling()
+        try:A.listener=A.api.protocol.subscriptions.subscribe(A.device_id,('control_response','binary_feedback','update_response','offline_device'),B,A.channel_number);A.api.protocol.warmup.request(A.update_packet);A._start_polling()
         except Exception as C:logging.error(f"error in async_added_to_hass fun e: {C}")
     async def async_will_remove_from_hass(A):
         if A.listener:A.listener();A.listener=_A
@@ -0,0 +1,25 @@
+"""Load the bundled TISControlProtocol package for the tests."""
+
+import importlib.util
+from pathlib import Path
+import sys
+
+# The package is imported as a top-level module like the integration does.
+# The component directory itself is not put on sys.path: its platform
+# modules (select.py, ...) would shadow the standard library.
+PACKAGE_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "custom_components"
+    / "tis"
+    / "TISControlProtocol"
+)
+
+if "TISControlProtocol" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "TISControlProtocol",
+        PACKAGE_DIR / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_DIR)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["TISControlProtocol"] = module
+    spec.loader.exec_module(module)
@@ -0,0 +1,102 @@
+"""Property checks of the resumable CRC against the reference vectors in crc.py."""
+
+import random
+
+import pytest
+
+from TISControlProtocol.crc import (
+    CRC_OFFSET,
+    CRCState,
+    checkCRC,
+    compute,
+    crc16,
+    packCRC,
+    verify,
+)
+from TISControlProtocol.Protocols.udp.PacketTemplate import PacketTemplate
+
+# (frame from the length byte, expected CRC), from the comments in crc.py
+REFERENCE_VECTORS = [
+    ([0x0F, 0x01, 0xFE, 0xFF, 0xFE, 0x00, 0x31, 0x01, 0x1F, 0x01, 0x64, 0x00, 0x00], 0x5D8F),
+    ([0x0F, 0xBB, 0xBB, 0xCC, 0xB1, 0x00, 0x31, 0x01, 0x2B, 0x02, 0x64, 0x00, 0x00], 0xBBAA),
+    ([0x0F, 0xBB, 0xBB, 0xCC, 0xB1, 0x00, 0x31, 0x01, 0x2B, 0x03, 0x64, 0x00, 0x00], 0xCD1E),
+]
+# complete frame with ip address, header and lead code
+REFERENCE_FRAME = [
+    0xC0, 0xA8, 0x01, 0x05,
+    0x53, 0x4D, 0x41, 0x52, 0x54, 0x43, 0x4C, 0x4F, 0x55, 0x44,
+    0xAA, 0xAA,
+    0x0F, 0xBB, 0xBB, 0xCC, 0xB1, 0x00, 0x31, 0x01, 0x2B, 0x03, 0x64, 0x00, 0x00,
+    0xCD, 0x1E,
+]  # fmt: skip
+
+
+def with_crc(data, crc: int) -> list:
+    return [*data, crc >> 8, crc & 0xFF]
+
+
+@pytest.mark.parametrize("data, crc", REFERENCE_VECTORS)
+def test_reference_vectors(data, crc):
+    assert crc16(data) == crc
+    assert compute(data, 0) == crc
+    assert compute(bytes(data), 0) == crc
+    assert verify(with_crc(data, crc), 0)
+    assert not verify(with_crc(data, crc ^ 1), 0)
+
+
+def test_reference_frame():
+    assert checkCRC(REFERENCE_FRAME)
+    assert verify(bytes(REFERENCE_FRAME))
+    assert verify(bytearray(REFERENCE_FRAME))
+    assert packCRC(REFERENCE_FRAME[:-2]) == REFERENCE_FRAME
+    assert compute(REFERENCE_FRAME[:-2]) == crc16(REFERENCE_FRAME[CRC_OFFSET:-2])
+
+
+@pytest.mark.parametrize("data, crc", REFERENCE_VECTORS)
+def test_every_split_point(data, crc):
+    for split in range(len(data) + 1):
+        state = CRCState(data[:split])
+        assert state.resume(data[split:]) == crc
+        # resume leaves the prefix state untouched
+        assert state.resume(data[split:]) == crc
+        assert state.update(data[split:]).value == crc
+
+
+@pytest.mark.parametrize("data, crc", REFERENCE_VECTORS)
+def test_every_pair_of_split_points(data, crc):
+    for first in range(len(data) + 1):
+        for second in range(first, len(data) + 1):
+            state = CRCState(data[:first]).update(data[first:second])
+            assert state.resume(bytes(data[second:])) == crc
+
+
+def test_random_splits():
+    rng = random.Random(4)
+    for _ in range(500):
+        data = bytes(rng.randrange(256) for _ in range(rng.randrange(1, 80)))
+        expected = crc16(data)
+        cuts = sorted(rng.randrange(len(data) + 1) for _ in range(rng.randrange(4)))
+        state = CRCState()
+        start = 0
+        for cut in cuts:
+            state.update(memoryview(data)[start:cut])
+            start = cut
+        assert state.resume(data[start:]) == expected
+        assert CRCState(value=crc16(data[:start])).resume(list(data[start:])) == expected
+
+
+def test_template_matches_packCRC():
+    rng = random.Random(7)
+    template = PacketTemplate("192.168.1.5", [0x01, 0x2B], [0x00, 0x31])
+    for _ in range(200):
+        payload = [rng.randrange(256) for _ in range(rng.randrange(0, 12))]
+        frame = template.build(payload)
+        assert verify(frame)
+        assert list(frame) == packCRC(list(frame[:-2]))
+
+
+def test_template_reference_vector():
+    # first vector: 0x01FE -> device 1/31, control channel 1 to 100%
+    template = PacketTemplate("192.168.1.5", [0x01, 0x1F], [0x00, 0x31])
+    frame = template.build([0x01, 0x64, 0x00, 0x00])
+    assert list(frame[CRC_OFFSET:]) == with_crc(*REFERENCE_VECTORS[0])
@@ -0,0 +1,195 @@
+"""Decoding tables for the registered payload codecs, one per operation code."""
+
+import struct
+
+import pytest
+
+from TISControlProtocol.Protocols.udp.PacketFrame import PAYLOAD_OFFSET
+from TISControlProtocol.Protocols.udp.PayloadCodec import (
+    CODECS,
+    Field,
+    PayloadCodec,
+    PayloadError,
+)
+
+CLIMATE_PAYLOAD = bytes([0x00, 0x02, 0x01, 0x18, 0x31, 0x00, 0x00, 0x1A, 0x00, 0x17])
+CLIMATE_VALUES = {
+    "ac_number": 2,
+    "state": 1,
+    "cool_temp": 24,
+    "hvac_mode": 3,
+    "fan_speed": 1,
+    "heat_temp": 26,
+    "auto_temp": 23,
+}
+
+HEALTH_PAYLOAD = bytes(
+    [0, 0, 0, 0, 0]
+    + [0x01, 0x2C]  # lux 300
+    + [0x00, 0x2D]  # noise 45
+    + [0x01, 0x90]  # eco2 400
+    + [0x00, 0x32]  # tvoc 50
+    + [23, 55]  # temp, humidity
+    + [0] * 12
+    + [0x00, 0x03]  # co 3
+    + [0, 0]
+    + [2, 1, 1]  # eco2, tvoc and co states
+)
+HEALTH_VALUES = {
+    "lux": 300,
+    "noise": 45,
+    "eco2": 400,
+    "tvoc": 50,
+    "temp": 23,
+    "humidity": 55,
+    "co": 3,
+    "eco2_state": 2,
+    "tvoc_state": 1,
+    "co_state": 1,
+}
+# a 10F sensor, or any payload shorter than the full layout: lux only
+HEALTH_LUX_ONLY = dict.fromkeys(HEALTH_VALUES, 0) | {"lux": 300}
+
+WEATHER_PAYLOAD = (
+    bytes([0, 0, 0, 0x04])
+    + struct.pack(">f", 21.5)
+    + bytes([60])
+    + struct.pack(">ff", 3.25, 7.5)
+    + struct.pack(">H", 12)
+    + struct.pack(">f", 1500.0)
+    + bytes([6])
+)
+WEATHER_VALUES = {
+    "wind": 0x04,
+    "temperature": 21.5,
+    "humidity": 60,
+    "wind_speed": 3.25,
+    "gust_speed": 7.5,
+    "rainfall": 12,
+    "lighting": 1500.0,
+    "uv": 6,
+}
+
+# operation code -> (payload, expected values)
+FULL_PAYLOADS = {
+    (0xE0, 0xED): (CLIMATE_PAYLOAD, CLIMATE_VALUES),
+    (0xE0, 0xEF): (CLIMATE_PAYLOAD, CLIMATE_VALUES),
+    (0x19, 0x45): (
+        bytes([0x01, 0x00, 0x00, 0x01, 0x00, 0x16]),
+        {"heater_number": 1, "state": 1, "temp": 22},
+    ),
+    (0xE3, 0xE8): (bytes([0x00, 0x15]), {"temp": 21}),
+    (0x20, 0x25): (HEALTH_PAYLOAD, HEALTH_VALUES),
+    (0x20, 0x21): (WEATHER_PAYLOAD, WEATHER_VALUES),
+}
+
+# operation code -> (payload, expected values) for payloads between
+# min_length and the full layout
+PARTIAL_PAYLOADS = {
+    (0x20, 0x25): [
+        (HEALTH_PAYLOAD[:7], HEALTH_LUX_ONLY),
+        (HEALTH_PAYLOAD[:30], HEALTH_LUX_ONLY),
+        (HEALTH_PAYLOAD[:33], HEALTH_LUX_ONLY),
+    ],
+}
+
+# operation code -> longest payload that is rejected
+SHORT_PAYLOADS = {
+    (0xE0, 0xED): CLIMATE_PAYLOAD[:9],
+    (0xE0, 0xEF): CLIMATE_PAYLOAD[:9],
+    (0x19, 0x45): bytes(5),
+    (0xE3, 0xE8): bytes(1),
+    (0x20, 0x25): HEALTH_PAYLOAD[:6],
+    (0x20, 0x21): WEATHER_PAYLOAD[:23],
+}
+
+
+def as_frame(payload: bytes) -> bytes:
+    """Wrap ``payload`` in a frame, header and CRC bytes are not checked."""
+    return bytes(PAYLOAD_OFFSET) + payload + b"\x00\x00"
+
+
+def test_every_codec_has_tables():
+    assert set(FULL_PAYLOADS) == set(CODECS)
+    assert set(SHORT_PAYLOADS) == set(CODECS)
+
+
+@pytest.mark.parametrize("operation_code", sorted(FULL_PAYLOADS))
+def test_full_payload(operation_code):
+    payload, expected = FULL_PAYLOADS[operation_code]
+    codec = CODECS[operation_code]
+    assert codec.decode(payload)._asdict() == expected
+    assert codec.decode(memoryview(payload))._asdict() == expected
+    assert codec.decode_frame(as_frame(payload))._asdict() == expected
+
+
+@pytest.mark.parametrize("operation_code", sorted(FULL_PAYLOADS))
+def test_trailing_bytes_are_ignored(operation_code):
+    payload, expected = FULL_PAYLOADS[operation_code]
+    codec = CODECS[operation_code]
+    assert codec.decode(payload + b"\xff\xff")._asdict() == expected
+    assert codec.decode_frame(as_frame(payload + b"\xff\xff"))._asdict() == expected
+
+
+@pytest.mark.parametrize(
+    "operation_code, payload, expected",
+    [
+        (operation_code, payload, expected)
+        for operation_code, cases in PARTIAL_PAYLOADS.items()
+        for payload, expected in cases
+    ],
+)
+def test_partial_payload_defaults(operation_code, payload, expected):
+    codec = CODECS[operation_code]
+    assert codec.decode(payload)._asdict() == expected
+    assert codec.decode_frame(as_frame(payload))._asdict() == expected
+
+
+@pytest.mark.parametrize("operation_code", sorted(SHORT_PAYLOADS))
+def test_short_payload_raises(operation_code):
+    payload = SHORT_PAYLOADS[operation_code]
+    codec = CODECS[operation_code]
+    with pytest.raises(PayloadError):
+        codec.decode(payload)
+    with pytest.raises(PayloadError):
+        codec.decode_frame(as_frame(payload))
+    with pytest.raises(PayloadError):
+        codec.decode(b"")
+
+
+def test_trusted_partial_payload_decodes_the_fields_it_contains():
+    codec = PayloadCodec(
+        "Partial",
+        [Field("a", 0), Field("b", 1, 2, default=-1), Field("c", 3, default=-1)],
+        min_length=1,
+    )
+    assert codec.decode(bytes([1]))._asdict() == {"a": 1, "b": -1, "c": -1}
+    assert codec.decode(bytes([1, 0, 2]))._asdict() == {"a": 1, "b": 2, "c": -1}
+    assert codec.decode(bytes([1, 0, 2, 3]))._asdict() == {"a": 1, "b": 2, "c": 3}
+
+
+def test_bit_fields_and_byte_order():
+    codec = PayloadCodec(
+        "Bits",
+        [
+            Field("high", 0, shift=4, mask=0x0F),
+            Field("low", 0, mask=0x0F),
+            Field("little", 1, 2, big_endian=False),
+            Field("signed", 3, 2, "int", scale=0.5),
+        ],
+    )
+    assert codec.decode(bytes([0xA5, 0x34, 0x12, 0xFF, 0xFE]))._asdict() == {
+        "high": 0x0A,
+        "low": 0x05,
+        "little": 0x1234,
+        "signed": -1.0,
+    }
+
+
+def test_invalid_layouts():
+    with pytest.raises(ValueError):
+        PayloadCodec("Width", [Field("a", 0, 3)])
+    with pytest.raises(ValueError):
+        PayloadCodec("Overlap", [Field("a", 0, 2), Field("b", 1)])
+    with pytest.raises(ValueError):
+        PayloadCodec("Default", [Field("a", 0), Field("b", 1)], min_length=1)